@@ -4,7 +4,9 @@ import time
 import struct
 import base64
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
 import numpy as np
 from queue import Empty
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, File, UploadFile
@@ -22,6 +24,9 @@ from app.models import DriverCardSecurityCheck
 
 router = APIRouter()
 
+# FaceMesh keeps tracking state between frames and is not thread-safe, so frames go through one worker
+face_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="face")
+
 
 def format_timestamp_ns(timestamp_ns: int) -> str:
     """
@@ -114,32 +119,28 @@ async def process_incoming_data(ws: WebSocket, session: ChatSession):
 
                 metadata["pcm"] = raw[8:]  # Extract PCM data after the first 8 bytes
 
-                # Check queue size before putting data
-                current_qsize = session.audio_chunks.qsize()
-
-                # Only put if queue is not full and do security check is not set and not generating
-                if current_qsize < MAX_AUDIO_QUEUE_SIZE:
-                    if (
-                        # not event_handler.do_security_check.is_set()
-                        # not session.synthesizer_manager.tts_final_generation_active
-                        # and not session.synthesizer_manager.llm_generation_active
-                        # and not session.tts_to_client
-                        not session.tts_client_playing
-                        and session.message_queue.empty()  # If not sending any text or audio chunks
-                        and not session.tts_chunk_sent
-                    ):
-                        await session.audio_chunks.put(metadata)
-                    else:
-                        # print(
-                        #     f"WebSocket: Audio chunk received while security check is active or generation is already running. Ignoring."
-                        # )  # Can be annoying, so we commented out
-                        # After a certain time, the print should stop (30 seconds as set in the security node)
-                        pass
+                # Only put if do security check is not set and not generating
+                if (
+                    # not event_handler.do_security_check.is_set()
+                    # not session.synthesizer_manager.tts_final_generation_active
+                    # and not session.synthesizer_manager.llm_generation_active
+                    # and not session.tts_to_client
+                    not session.tts_client_playing
+                    and session.message_queue.empty()  # If not sending any text or audio chunks
+                    and not session.tts_chunk_sent
+                ):
+                    if session.audio_chunks.full():
+                        # The ring overwrites the oldest chunk
+                        print(
+                            f"WebSocket: Audio queue is full ({MAX_AUDIO_QUEUE_SIZE}), dropping the oldest chunk."
+                        )
+                    session.audio_chunks.put_nowait(metadata)
                 else:
-                    # Queue is full, apply back-pressure
-                    print(
-                        f"WebSocket: Audio queue is full ({current_qsize}), applying back-pressure."
-                    )
+                    # print(
+                    #     f"WebSocket: Audio chunk received while security check is active or generation is already running. Ignoring."
+                    # )  # Can be annoying, so we commented out
+                    # After a certain time, the print should stop (30 seconds as set in the security node)
+                    pass
 
             elif "text" in msg and msg["text"]:
                 # Text-based message: parse JSON
@@ -192,25 +193,25 @@ async def send_text_messages(ws: WebSocket, message_queue: asyncio.Queue):
     """
     Continuously sends text messages from a queue to the client via WebSocket.
 
-    Waits for messages on the `message_queue`, formats them as JSON, and sends
-    them to the connected WebSocket client. Logs non-TTS messages.
+    Waits for messages on the `message_queue`, which are already JSON-encoded by
+    ChatSession.enqueue_message, and sends them to the connected WebSocket client.
+    Logs non-TTS messages.
 
     Args:
         ws: The WebSocket connection instance.
-        message_queue: An asyncio queue yielding dictionaries to be sent as JSON.
+        message_queue: An asyncio queue yielding (type, JSON text) tuples.
     """
     try:
         while True:
             await asyncio.sleep(0.001)  # Yield control
-            data = await message_queue.get()
-            msg_type = data.get("type")
+            msg_type, payload = await message_queue.get()
 
             if msg_type != "tts_chunk":
                 print(
-                    f"WebSocket: Sending message of type '{msg_type}' to client: {data}"
+                    f"WebSocket: Sending message of type '{msg_type}' to client: {payload}"
                 )
 
-            await ws.send_json(data)
+            await ws.send_text(payload)
     except asyncio.CancelledError:
         pass
     except WebSocketDisconnect as e:
@@ -357,12 +358,7 @@ async def send_tts_chunks(session: ChatSession):
 
             base64_chunk = base64.b64encode(chunk).decode("utf-8")
 
-            session.message_queue.put_nowait(
-                {
-                    "type": "tts_chunk",
-                    "content": base64_chunk,
-                }
-            )
+            session.enqueue_message("tts_chunk", base64_chunk)
 
             last_chunk_sent = time.time()
 
@@ -532,28 +528,65 @@ async def eye_tracking(
 
     Receives raw image data (JPEG/PNG) from the client, processes it to extract
     eye tracking metrics, and sends back a JSON response with the results.
+    Frames are received while the previous one is processed off the event loop;
+    frames arriving faster than they can be processed are dropped, newest wins.
 
     Args:
         ws (WebSocket): The WebSocket connection instance.
         proc (FaceProcessor, optional): Face processor. Defaults to Depends(get_face_processor).
     """
     await ws.accept()
+    loop = asyncio.get_running_loop()
+    latest_frame: Optional[bytes] = None
+    frame_ready = asyncio.Event()
+
+    async def receive_frames():
+        # Keeps reading while the previous frame is processed, a newer frame replaces a pending one
+        nonlocal latest_frame
+        try:
+            while True:
+                latest_frame = await ws.receive_bytes()  # raw JPEG/PNG
+                frame_ready.set()
+        finally:
+            frame_ready.set()
+
+    receiver = asyncio.create_task(receive_frames())
     try:
         while True:
-            data = await ws.receive_bytes()  # raw JPEG/PNG
-            img_np = np.frombuffer(data, dtype=np.uint8)
-            frame = cv2.imdecode(img_np, cv2.IMREAD_COLOR)
-            if frame is None:
+            await frame_ready.wait()
+            frame_ready.clear()
+            if receiver.done():
+                receiver.result()  # Re-raises the disconnect
+                break
+
+            data, latest_frame = latest_frame, None
+            result = await loop.run_in_executor(
+                face_executor, decode_and_process_frame, proc, data
+            )
+            if result is None:
                 print(json.dumps({"error": "decode_failed"}))
                 continue
 
-            result = proc.process_frame(frame)
             await ws.send_text(json.dumps(result, ensure_ascii=False))
-            await asyncio.sleep(0)
     except WebSocketDisconnect:
         pass
     except Exception as e:
         print(json.dumps({"error": str(e)}))
+    finally:
+        receiver.cancel()
+
+
+def decode_and_process_frame(proc: FaceProcessor, data: bytes) -> Optional[dict]:
+    """
+    Decodes an encoded image and runs eye tracking on it. Runs on the face executor.
+
+    Returns:
+        The metrics from process_frame as a dict, or None if the image could not be decoded.
+    """
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        return None
+    return proc.process_frame(frame).to_dict()
 
 
 def preprocess_face(face_img, size=(224, 224)):
@@ -1,14 +1,24 @@
-from fastapi import APIRouter
-from fastapi.responses import HTMLResponse
+import gzip
+from fastapi import APIRouter, Request
+from fastapi.responses import HTMLResponse, Response
 
 router = APIRouter()
 
 
-# TODO: One problem I am too lazy to change is currently, the websocket opens by clicking the record button (which also starts the mic)
-# The actual page should not do this
-@router.get("/ws/", response_class=HTMLResponse)
-async def websocket_test_page():
-    return """
+def _html_response(request: Request, html: str, gz: bytes) -> Response:
+    """
+    Serve a test page, using the gzip body compressed at import when the client accepts it.
+    """
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=gz,
+            media_type="text/html",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return HTMLResponse(content=html, headers={"Vary": "Accept-Encoding"})
+
+
+_WS_TEST_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -852,11 +862,17 @@ renderMessages();
     </body>
     </html>
     """
+_WS_TEST_GZ = gzip.compress(_WS_TEST_HTML.encode("utf-8"), 9)
 
 
-@router.get("/faq-test/", response_class=HTMLResponse)
-async def faq_test_page():
-    return """
+# TODO: One problem I am too lazy to change is currently, the websocket opens by clicking the record button (which also starts the mic)
+# The actual page should not do this
+@router.get("/ws/", response_class=HTMLResponse)
+async def websocket_test_page(request: Request):
+    return _html_response(request, _WS_TEST_HTML, _WS_TEST_GZ)
+
+
+_FAQ_TEST_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -933,11 +949,15 @@ async def faq_test_page():
     </body>
     </html>
     """
+_FAQ_TEST_GZ = gzip.compress(_FAQ_TEST_HTML.encode("utf-8"), 9)
 
 
-@router.get("/vector-ui/", response_class=HTMLResponse)
-async def vector_ui_test_page():
-    return """
+@router.get("/faq-test/", response_class=HTMLResponse)
+async def faq_test_page(request: Request):
+    return _html_response(request, _FAQ_TEST_HTML, _FAQ_TEST_GZ)
+
+
+_VECTOR_UI_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -1145,11 +1165,15 @@ async def vector_ui_test_page():
     </body>
     </html>
     """
+_VECTOR_UI_GZ = gzip.compress(_VECTOR_UI_HTML.encode("utf-8"), 9)
 
 
-@router.get("/security-test/", response_class=HTMLResponse)
-async def security_test_page():
-    return """
+@router.get("/vector-ui/", response_class=HTMLResponse)
+async def vector_ui_test_page(request: Request):
+    return _html_response(request, _VECTOR_UI_HTML, _VECTOR_UI_GZ)
+
+
+_SECURITY_TEST_HTML = """
     <!DOCTYPE html>
     <html>
         <head>
@@ -1253,11 +1277,15 @@ async def security_test_page():
 
     </html>
     """
+_SECURITY_TEST_GZ = gzip.compress(_SECURITY_TEST_HTML.encode("utf-8"), 9)
 
 
-@router.get("/workflow-ui/", response_class=HTMLResponse)
-async def workflow_ui_test_page():
-    return """
+@router.get("/security-test/", response_class=HTMLResponse)
+async def security_test_page(request: Request):
+    return _html_response(request, _SECURITY_TEST_HTML, _SECURITY_TEST_GZ)
+
+
+_WORKFLOW_UI_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -1310,11 +1338,15 @@ async def workflow_ui_test_page():
     </body>
     </html>
     """
+_WORKFLOW_UI_GZ = gzip.compress(_WORKFLOW_UI_HTML.encode("utf-8"), 9)
 
 
-@router.get("/stream/", response_class=HTMLResponse)
-async def stream_test():
-    return """
+@router.get("/workflow-ui/", response_class=HTMLResponse)
+async def workflow_ui_test_page(request: Request):
+    return _html_response(request, _WORKFLOW_UI_HTML, _WORKFLOW_UI_GZ)
+
+
+_STREAM_TEST_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -1353,12 +1385,15 @@ async def stream_test():
     </body>
     </html>
     """
+_STREAM_TEST_GZ = gzip.compress(_STREAM_TEST_HTML.encode("utf-8"), 9)
 
 
-@router.get("/vision-test/", response_class=HTMLResponse)
-async def vision_test_page():
-    return HTMLResponse(
-        """
+@router.get("/stream/", response_class=HTMLResponse)
+async def stream_test(request: Request):
+    return _html_response(request, _STREAM_TEST_HTML, _STREAM_TEST_GZ)
+
+
+_VISION_TEST_HTML = """
 <!doctype html>
 <html lang="en">
 <head>
@@ -1398,8 +1433,8 @@ async def vision_test_page():
           <input id="nth" type="range" min="1" max="10" step="1" value="1">
         </div>
         <div>
-          <label>Canvas Downscale (%) <span id="scaleVal">100</span></label>
-          <input id="scale" type="range" min="30" max="100" step="5" value="100">
+          <label>Send Resolution <span id="scaleVal">320x240</span></label>
+          <input id="scale" type="range" min="0" max="2" step="1" value="1">
         </div>
       </div>
 
@@ -1463,25 +1498,43 @@ async def vision_test_page():
   const liveSnapBtn = document.getElementById('liveSnapBtn');
 
   let stream, ws, rafId = null, frameCount = 0, sentCount = 0;
-  let lastReport = performance.now(), fpsSamples = [];
+  const FPS_WINDOW = 20;
+  const fpsBuf = new Float32Array(FPS_WINDOW);
+  let lastReport = performance.now(), fpsIdx = 0, fpsFilled = 0, fpsSum = 0;
   let nth = parseInt(nthInput.value, 10);
   let quality = parseFloat(qInput.value);
-  let downscale = parseInt(scaleInput.value, 10);
+
+  // Frames are resized on the client before JPEG encoding, the model only needs the face region
+  const TARGET_W = 320, TARGET_H = 240;
+  const SIZE_PRESETS = [[160, 120], [TARGET_W, TARGET_H], [640, 480]];
+  const frameCanvas = document.createElement('canvas');
+  const frameCtx = frameCanvas.getContext('2d');
+  frameCanvas.width = TARGET_W;
+  frameCanvas.height = TARGET_H;
 
   qInput.oninput = () => (quality = parseFloat(qInput.value), qVal.textContent = qInput.value);
   nthInput.oninput = () => (nth = parseInt(nthInput.value, 10), nthVal.textContent = nthInput.value);
-  scaleInput.oninput = () => (downscale = parseInt(scaleInput.value, 10), scaleVal.textContent = scaleInput.value);
+  scaleInput.oninput = () => {
+    const [w, h] = SIZE_PRESETS[parseInt(scaleInput.value, 10)];
+    frameCanvas.width = w;
+    frameCanvas.height = h;
+    scaleVal.textContent = `${w}x${h}`;
+  };
 
   function wsUrl() {
     const proto = (location.protocol === 'https:') ? 'wss' : 'ws';
-    return `${proto}://${location.host}/eye_tracking/`;
+    return `${proto}://${location.host}/api/chat/chatbot/eye_tracking/`;
   }
 
   function updateStats(lastSizeBytes) {
     const now = performance.now();
-    fpsSamples.push(1000 / (now - lastReport));
-    if (fpsSamples.length > 20) fpsSamples.shift();
-    const avgFps = fpsSamples.reduce((a,b) => a+b, 0) / Math.max(1, fpsSamples.length);
+    const inst = 1000 / (now - lastReport);
+    // Ring buffer with a running sum, O(1) per frame
+    fpsSum += inst - fpsBuf[fpsIdx];
+    fpsBuf[fpsIdx] = inst;
+    fpsIdx = (fpsIdx + 1) % FPS_WINDOW;
+    if (fpsFilled < FPS_WINDOW) fpsFilled++;
+    const avgFps = fpsSum / fpsFilled;
 
     statsEl.textContent = `sent: ${sentCount} | last: ${(lastSizeBytes/1024).toFixed(1)} KB | avg FPS: ${avgFps.toFixed(1)}`;
     lastReport = now;
@@ -1498,20 +1551,29 @@ async def vision_test_page():
   function drawToCanvas() {
     const vw = video.videoWidth, vh = video.videoHeight;
     if (!vw || !vh) return false;
-    const s = Math.max(0.3, Math.min(1.0, downscale / 100));
-    canvas.width = Math.round(vw * s);
-    canvas.height = Math.round(vh * s);
+    canvas.width = vw;
+    canvas.height = vh;
     const ctx = canvas.getContext('2d');
     ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
     return true;
   }
 
+  async function drawFrame() {
+    const vw = video.videoWidth, vh = video.videoHeight;
+    if (!vw || !vh) return false;
+    const bmp = await createImageBitmap(video, 0, 0, vw, vh, {
+      resizeWidth: frameCanvas.width, resizeHeight: frameCanvas.height, resizeQuality: 'low'
+    });
+    frameCtx.drawImage(bmp, 0, 0);
+    bmp.close();
+    return true;
+  }
+
   async function sendOneFrame() {
     if (!ws || ws.readyState !== 1) return;
-    if (!drawToCanvas()) return;
-    console.log(ws)
+    if (!(await drawFrame())) return;
     return new Promise((resolve) => {
-      canvas.toBlob(async (blob) => {
+      frameCanvas.toBlob(async (blob) => {
         if (!blob) { resolve(); return; }
         const buf = await blob.arrayBuffer();
         ws.send(buf);
@@ -1533,7 +1595,7 @@ async def vision_test_page():
 
   function startStreaming() {
     if (rafId) return;
-    ws = new WebSocket("ws://localhost:8000/api/chat/chatbot/eye_tracking/");
+    ws = new WebSocket(wsUrl());
     ws.binaryType = 'arraybuffer';
 
     ws.onopen = () => { wsState.textContent = 'WS: connected'; loop(); };
@@ -1568,7 +1630,7 @@ async def vision_test_page():
     if (!file) { alert('Choose an image file first.'); return; }
     const fd = new FormData();
     fd.append('file', file, file.name);
-    const res = await fetch('http://localhost:8000/api/chat/chatbot/liveness_check/', { method: 'POST', body: fd });
+    const res = await fetch('/api/chat/chatbot/liveness_check/', { method: 'POST', body: fd });
     const json = await res.json();
     liveOut.textContent = JSON.stringify(json, null, 2);
   };
@@ -1580,7 +1642,7 @@ async def vision_test_page():
     canvas.toBlob(async (blob) => {
       const fd = new FormData();
       fd.append('file', new File([blob], 'snap.jpg', { type: 'image/jpeg' }));
-      const res = await fetch('http://localhost:8000/api/chat/chatbot/liveness_check/', { method: 'POST', body: fd });
+      const res = await fetch('/api/chat/chatbot/liveness_check/', { method: 'POST', body: fd });
       const json = await res.json();
       liveOut.textContent = JSON.stringify(json, null, 2);
     }, 'image/jpeg', 0.9);
@@ -1593,4 +1655,9 @@ async def vision_test_page():
 </body>
 </html>
     """
-    )
+_VISION_TEST_GZ = gzip.compress(_VISION_TEST_HTML.encode("utf-8"), 9)
+
+
+@router.get("/vision-test/", response_class=HTMLResponse)
+async def vision_test_page(request: Request):
+    return _html_response(request, _VISION_TEST_HTML, _VISION_TEST_GZ)
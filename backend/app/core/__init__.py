@@ -1 +1,2 @@
 from app.core.config import *
+from app.core.logger import setup_logging, shutdown_logging
@@ -2,29 +2,32 @@ import os
 import json
 import torch
 from pathlib import Path
-from dotenv import load_dotenv
-
-
-load_dotenv()
 
 # MODEL
 MODEL_CONFIG_PATH = os.getenv("MODEL_CONFIG_PATH", "./llm_config.json")
 
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "24h")  # Keeps the local model resident
+# API roots of the hosted providers, honouring the same overrides as their langchain clients
+DEEPSEEK_API_BASE = os.getenv("DEEPSEEK_API_BASE", "https://api.deepseek.com/v1")
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
 EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "llama3.2")
+EMBEDDING_KEEP_ALIVE = int(os.getenv("EMBEDDING_KEEP_ALIVE", -1))  # Seconds, negative keeps it loaded
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "documents")
 CHROMA_PERSISTS_DIR = os.getenv("CHROMA_PERSISTS_DIR", "./chroma_langchain_db")
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", 7000))
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
+# LOGGING
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # WORKER
 BASE_DIR = Path(__file__).resolve().parents[2]
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
 
 UPLOAD_DIR = BASE_DIR / "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 ALLOWED_EXT = [".pdf", ".docx"]
 CHUNK_SIZE = 400
@@ -32,23 +35,17 @@ CHUNK_OVERLAP = 0
 
 # SQLDB
 DB_PATH = BASE_DIR / "sql_db" / "sql.db"
-os.makedirs(DB_PATH.parent, exist_ok=True)
-
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 # Workflow
 WORKFLOW_CONFIG_PATH = os.getenv("WORKFLOW_CONFIG_PATH", "./workflow_config.json")
 
-# Create empty json if not already exists
-if not Path(WORKFLOW_CONFIG_PATH).exists():
-    with open(WORKFLOW_CONFIG_PATH, "w") as f:
-        f.write("{}")
-
 # STT
 MAIN_STT_MODEL = os.getenv("MAIN_STT_MODEL", "distil-whisper/distil-large-v3.5-ct2")
 RT_STT_MODEL = os.getenv("RT_STT_MODEL", "tiny.en")
 STT_SILENCE_TIMEMOUT = os.getenv("STT_SILENCE_TIMEOUT", 1.5)
 RT_PROCESSING_PAUSE = os.getenv("RT_PROCESSING_PAUSE", 0.02)
+# faster-whisper quantization, int8 weights on both devices unless overridden
+STT_COMPUTE_TYPE = os.getenv("STT_COMPUTE_TYPE", "int8_float16" if DEVICE == "cuda" else "int8")
 
 # TTS
 SAMPLE_RATE = 24000
@@ -59,15 +56,12 @@ MAX_AUDIO_QUEUE_SIZE = int(os.getenv("MAX_AUDIO_QUEUE_SIZE", 50))
 VOICE = "af_heart"
 LANG_CODE = "a"
 SPEED = 0.9
+# Kokoro inference precision: "fp32", "bf16" (CUDA autocast) or "int8" (CPU dynamic quantization)
+TTS_PRECISION = os.getenv("TTS_PRECISION", "fp32").lower()
 
 # NOTIFICATION. Read from webhook_config.json file
 WEBHOOK_CONFIG_PATH = os.getenv("WEBHOOK_CONFIG_PATH", "./webhook_config.json")
 
-# Create empty json if not already exists with empty url and key
-if not Path(WEBHOOK_CONFIG_PATH).exists():
-    with open(WEBHOOK_CONFIG_PATH, "w") as f:
-        f.write('{"url": "", "key": ""}')
-
 # LIVENESS
 LIVENESS_MODEL_PATH = os.path.join(
     os.path.dirname(__file__),
@@ -81,3 +75,28 @@ LIVENESS_MODEL_PATH = os.path.join(
 FACE_ANALYSIS_MODEL_PATH = (
     Path(__file__).resolve().parent.parent.parent / "models" / "face_analysis"
 )
+
+# Optional MediaPipe Tasks bundle (face_landmarker.task), used instead of the FaceMesh solution when present
+FACE_LANDMARKER_MODEL_PATH = (
+    Path(__file__).resolve().parent.parent.parent
+    / "models"
+    / "face_landmarker"
+    / "face_landmarker.task"
+)
+
+
+def bootstrap_paths():
+    """
+    Create the directories and default config files the app expects.
+    Called once per process at startup instead of on every import of this module.
+    """
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    # Create empty json if not already exists
+    if not Path(WORKFLOW_CONFIG_PATH).exists():
+        Path(WORKFLOW_CONFIG_PATH).write_text("{}")
+
+    # Create empty json if not already exists with empty url and key
+    if not Path(WEBHOOK_CONFIG_PATH).exists():
+        Path(WEBHOOK_CONFIG_PATH).write_text('{"url": "", "key": ""}')
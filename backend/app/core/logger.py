@@ -0,0 +1,57 @@
+"""
+Process-wide logging setup.
+
+Records are put on a queue by a QueueHandler so the threads emitting them (STT/TTS callbacks,
+the event loop) never block on stdout. A single QueueListener thread formats and writes them.
+"""
+
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+from app.core.config import LOG_LEVEL
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def setup_logging():
+    """
+    Attach the queue-based handler to the "app" logger. Safe to call more than once.
+    The level comes from the LOG_LEVEL environment variable, so DEBUG records are skipped
+    entirely (no formatting) unless explicitly enabled.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger = logging.getLogger("app")
+    logger.addHandler(_queue_handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+
+def shutdown_logging():
+    """
+    Flush the records still queued and stop the listener thread. Call it as the last
+    shutdown step, the listener is a daemon thread and would otherwise drop them at exit.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    logging.getLogger("app").removeHandler(_queue_handler)
+    _listener.stop()  # Writes every record queued so far before returning
+    _listener = None
+    _queue_handler = None
@@ -1,28 +1,53 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from app.core import bootstrap_paths, setup_logging, shutdown_logging
 from app.dependencies.vector_store import get_vector_manager
 from app.dependencies.sql import get_sql_manager
-from app.dependencies.llm import get_llm, get_conversation_manager
+from app.dependencies.llm import (
+    get_conversation_manager,
+    get_http_client,
+    preload_llm,
+)
 from app.dependencies.stt import get_stt_recorder
-from app.dependencies.tts import get_tts_stream
+from app.dependencies.tts import get_tts_service, get_tts_stream
 from app.dependencies.face import get_face_processor, get_liveness_dependencies
 from app.dependencies.session import get_chat_session
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize dependencies
-    get_llm()
-    get_vector_manager()  # Automatically load the tokenizer
-    get_sql_manager()
-    get_stt_recorder()
+    setup_logging()
+    bootstrap_paths()
+
+    # Initialize independent dependencies concurrently, each one loads its own model
+    await asyncio.gather(
+        asyncio.to_thread(preload_llm),  # Builds the llm and warms it (or its link)
+        asyncio.to_thread(get_vector_manager),  # Automatically load the tokenizer
+        asyncio.to_thread(get_sql_manager),
+        asyncio.to_thread(get_stt_recorder),
+        asyncio.to_thread(get_tts_service),  # Kokoro load + prewarm
+        asyncio.to_thread(get_face_processor),
+        asyncio.to_thread(get_liveness_dependencies),
+    )
+
+    # Keep-alive client shared by the hosted llm providers
+    app.state.http_client = get_http_client()
+
+    # These depend on the llm, vector and sql managers (and the TTS service) being ready
     get_conversation_manager()
     get_tts_stream()
-    get_face_processor()
-    get_liveness_dependencies()
+
+    # Must run on the event loop as it schedules the STT task
     get_chat_session().start()
 
     yield
 
     # Release memory
     get_chat_session().shutdown()
+    get_stt_recorder().shutdown(hard_shutdown=True)
+    get_tts_service().engine.close()
+    app.state.http_client.close()
+
+    # Last, so the shutdown logs above are written out
+    shutdown_logging()
@@ -1,24 +1,59 @@
 import os
-from functools import lru_cache
+from typing import Optional
 import onnxruntime as ort
 from insightface.app import FaceAnalysis
-from app.services.face_service import FaceProcessor
-from app.core import LIVENESS_MODEL_PATH, DEVICE, FACE_ANALYSIS_MODEL_PATH
+from app.services.face_service import FaceProcessor, FaceLandmarkerMesh
+from app.core import (
+    LIVENESS_MODEL_PATH,
+    DEVICE,
+    FACE_ANALYSIS_MODEL_PATH,
+    FACE_LANDMARKER_MODEL_PATH,
+)
+
+_face_processor: Optional[FaceProcessor] = None
+_liveness_dependencies: Optional[tuple] = None
 
 
-@lru_cache(maxsize=1)
 def get_face_processor() -> FaceProcessor:
-    return FaceProcessor()
+    global _face_processor
+    if _face_processor is None:
+        # Prefer the Tasks FaceLandmarker when its model bundle is installed
+        mesh = (
+            FaceLandmarkerMesh(FACE_LANDMARKER_MODEL_PATH)
+            if FACE_LANDMARKER_MODEL_PATH.exists()
+            else None
+        )
+        _face_processor = FaceProcessor(mesh=mesh)
+    return _face_processor
 
 
-@lru_cache(maxsize=1)
 def get_liveness_dependencies() -> tuple:
-    face_app = FaceAnalysis(name="buffalo_l", root=FACE_ANALYSIS_MODEL_PATH)
+    global _liveness_dependencies
+    if _liveness_dependencies is None:
+        _liveness_dependencies = _load_liveness_dependencies()
+    return _liveness_dependencies
+
+
+def _load_liveness_dependencies() -> tuple:
+    # Only select the GPU when onnxruntime was actually built with CUDA support
+    use_gpu = (
+        DEVICE == "cuda" and "CUDAExecutionProvider" in ort.get_available_providers()
+    )
+    providers = (
+        ["CUDAExecutionProvider", "CPUExecutionProvider"]
+        if use_gpu
+        else ["CPUExecutionProvider"]
+    )
+
+    face_app = FaceAnalysis(
+        name="buffalo_l", root=FACE_ANALYSIS_MODEL_PATH, providers=providers
+    )
     # GPU = 0, CPU = -1
-    iddevice = 0 if DEVICE == "GPU" else -1
-    face_app.prepare(ctx_id=iddevice)
+    face_app.prepare(ctx_id=0 if use_gpu else -1, det_size=(640, 640))
 
     # Load ONNX model for liveness classification
-    onnx_session = ort.InferenceSession(os.path.abspath(LIVENESS_MODEL_PATH))
+    onnx_session = ort.InferenceSession(
+        os.path.abspath(LIVENESS_MODEL_PATH), providers=providers
+    )
 
     return face_app, onnx_session
@@ -1,8 +1,17 @@
 import json
-import os
-from functools import lru_cache
+from functools import cache
+from pathlib import Path
+from typing import Optional
 
-from app.core import MODEL_CONFIG_PATH, WORKFLOW_CONFIG_PATH
+import httpx
+
+from app.core import (
+    MODEL_CONFIG_PATH,
+    WORKFLOW_CONFIG_PATH,
+    OLLAMA_KEEP_ALIVE,
+    DEEPSEEK_API_BASE,
+    OPENAI_API_BASE,
+)
 from app.dependencies.sql import get_sql_manager
 from app.dependencies.vector_store import get_vector_manager
 from app.models import GraphConfig
@@ -14,33 +23,97 @@ from langchain_openai import ChatOpenAI
 
 # Here, we could switch to different LLM Provider such as vllm as well, as long as it inherits use the BaseChatModel interface.
 
+# Reuse connections to the Ollama server
+OLLAMA_CLIENT_KWARGS = {
+    "http2": True,
+    "timeout": httpx.Timeout(None, connect=10.0),  # Cold model loads can take minutes
+    "limits": httpx.Limits(max_keepalive_connections=8, keepalive_expiry=3600),
+}
+
+# API roots of the hosted providers
+PROVIDER_API_BASES = {"deepseek": DEEPSEEK_API_BASE, "openai": OPENAI_API_BASE}
+
+_http_client: Optional[httpx.Client] = None
+_conversation_manager: Optional[ConversationManager] = None
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Shared HTTP client for the hosted providers so every call reuses the same TCP/TLS connection.
 
-@lru_cache(maxsize=1)
+    Returns:
+        httpx.Client: A keep-alive HTTP/2 client.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(keepalive_expiry=600),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+    return _http_client
+
+
+@cache
 def get_llm(
     config_path: str = MODEL_CONFIG_PATH,
 ) -> BaseChatModel:
-    config = json.load(open(config_path, "r"))
+    config = json.loads(Path(config_path).read_bytes())
     provider = config.get("backend_provider", "ollama")
     model_name = config.get("model_name", "llama3.2")
     base_url = config.get("base_url", "http://localhost:11434")
     api_key = config.get("api_key", "")
 
     if provider == "ollama":
-        llm = ChatOllama(model=model_name, base_url=base_url)
+        llm = ChatOllama(
+            model=model_name,
+            base_url=base_url,
+            keep_alive=OLLAMA_KEEP_ALIVE,
+            client_kwargs=OLLAMA_CLIENT_KWARGS,
+        )
     elif provider == "deepseek":
-        llm = ChatDeepSeek(model=model_name, api_key=api_key)
+        llm = ChatDeepSeek(
+            model=model_name, api_key=api_key, http_client=get_http_client()
+        )
     elif provider == "openai":
-        llm = ChatOpenAI(model=model_name, api_key=api_key)
+        llm = ChatOpenAI(
+            model=model_name, api_key=api_key, http_client=get_http_client()
+        )
     else:
         raise ValueError(f"Unsupported model backend provider: {provider}")
 
-    # Preload the model to avoid latency during the first request
-    _ = llm.invoke("Hi from preload")
-
     return llm
 
 
-@lru_cache(maxsize=1)
+def warm_llm_connection(provider: str):
+    """
+    Opens the keep-alive connection to a hosted provider with a cheap `GET /models`,
+    so the first real request does not pay for the TCP/TLS handshake.
+
+    Args:
+        provider (str): Key of PROVIDER_API_BASES.
+    """
+    try:
+        get_http_client().get(f"{PROVIDER_API_BASES[provider]}/models", timeout=5.0)
+    except httpx.HTTPError as e:
+        print(f"LLM: Connection warm-up failed: {e}")
+
+
+def preload_llm():
+    """
+    Gets the llm ready before any user request. Called once from the lifespan handler.
+    A local Ollama model gets a first request so its weights are loaded, hosted providers
+    only need their connection opened.
+    """
+    llm = get_llm()
+    if isinstance(llm, ChatOllama):
+        _ = llm.invoke("Hi from preload")
+    elif isinstance(llm, ChatDeepSeek):
+        warm_llm_connection("deepseek")
+    else:
+        warm_llm_connection("openai")
+
+
 def get_conversation_manager() -> ConversationManager:
     """
     Creates and returns a ConversationManager instance.
@@ -48,16 +121,18 @@ def get_conversation_manager() -> ConversationManager:
     Returns:
         ConversationManager: An instance of the ConversationManager class.
     """
+    global _conversation_manager
+    if _conversation_manager is not None:
+        return _conversation_manager
+
     # Load json config file
-    with open(WORKFLOW_CONFIG_PATH, "r") as f:
-        workflow_config = json.load(f)
-        workflow_config = GraphConfig(**workflow_config)
+    workflow_config = GraphConfig(**json.loads(Path(WORKFLOW_CONFIG_PATH).read_bytes()))
 
-    manager = ConversationManager(
+    _conversation_manager = ConversationManager(
         llm=get_llm(),
         vector_manager=get_vector_manager(),
         sql_manager=get_sql_manager(),
         config=workflow_config,
     )
 
-    return manager
+    return _conversation_manager
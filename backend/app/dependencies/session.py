@@ -1,10 +1,11 @@
-from functools import lru_cache
+from typing import Optional
 from app.services import ChatSession
 from app.dependencies.stt import get_stt_recorder
 from app.dependencies.tts import get_tts_stream
 
+_chat_session: Optional[ChatSession] = None
+
 
-@lru_cache(maxsize=1)
 def get_chat_session() -> ChatSession:
     """
     Creates and returns a ChatSession instance.
@@ -12,4 +13,9 @@ def get_chat_session() -> ChatSession:
     Returns:
         ChatSession: An instance of the ChatSession class.
     """
-    return ChatSession(stt_pipeline=get_stt_recorder(), tts_pipeline=get_tts_stream())
+    global _chat_session
+    if _chat_session is None:
+        _chat_session = ChatSession(
+            stt_pipeline=get_stt_recorder(), tts_pipeline=get_tts_stream()
+        )
+    return _chat_session
@@ -1,13 +1,12 @@
-import sqlite3
-from functools import lru_cache
-from app.services import SQLManager
+from typing import Optional
+from app.services import SQLManager, SQLConnectionPool
 from app.core import DB_PATH
 
-@lru_cache(maxsize=1)
-def get_sql_manager() -> SQLManager:
-    connection = sqlite3.connect(DB_PATH, check_same_thread=False)
-    connection.row_factory = (
-        sqlite3.Row
-    )  # Enable row factory to return rows as dictionaries
-    return SQLManager(connection=connection)
+_sql_manager: Optional[SQLManager] = None
 
+def get_sql_manager() -> SQLManager:
+    global _sql_manager
+    if _sql_manager is None:
+        pool = SQLConnectionPool(DB_PATH, read_size=4)
+        _sql_manager = SQLManager(pool=pool)
+    return _sql_manager
@@ -1,11 +1,14 @@
-from functools import lru_cache
+from typing import Optional
 from app.services import SttPipeline, SttService
 
+_stt_recorder: Optional[SttPipeline] = None
+
 
-@lru_cache(maxsize=1)
 def get_stt_recorder() -> SttPipeline:
-    service = SttService()
+    global _stt_recorder
+    if _stt_recorder is None:
+        service = SttService()
 
-    pipeline = SttPipeline(transcriber=service)
+        _stt_recorder = SttPipeline(transcriber=service)
 
-    return pipeline
+    return _stt_recorder
@@ -1,14 +1,27 @@
-from functools import lru_cache
+from typing import Optional
 from app.services import TtsService, TtsPipeline
 from app.dependencies.llm import get_conversation_manager
 
+_tts_service: Optional[TtsService] = None
+_tts_stream: Optional[TtsPipeline] = None
 
-@lru_cache(maxsize=1)
-def get_tts_stream() -> TtsPipeline:
-    service = TtsService()
 
-    pipeline = TtsPipeline(
-        synthesizer=service, conversation_manager=get_conversation_manager()
-    )
+def get_tts_service() -> TtsService:
+    """
+    Loads the TTS model. Kept separate from the pipeline so it can load while the LLM warms up.
+    """
+    global _tts_service
+    if _tts_service is None:
+        _tts_service = TtsService()
+    return _tts_service
+
+
+def get_tts_stream() -> TtsPipeline:
+    global _tts_stream
+    if _tts_stream is None:
+        _tts_stream = TtsPipeline(
+            synthesizer=get_tts_service(),
+            conversation_manager=get_conversation_manager(),
+        )
 
-    return pipeline
+    return _tts_stream
@@ -1,7 +1,11 @@
 from app.services import VectorStoreManager
-from functools import lru_cache
+from typing import Optional
+
+_vector_manager: Optional[VectorStoreManager] = None
 
 
-@lru_cache(maxsize=1)
 def get_vector_manager() -> VectorStoreManager:
-    return VectorStoreManager()
+    global _vector_manager
+    if _vector_manager is None:
+        _vector_manager = VectorStoreManager()
+    return _vector_manager
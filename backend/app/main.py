@@ -1,3 +1,8 @@
+from dotenv import load_dotenv
+
+# Load .env once for the API process, before app.core reads the environment
+load_dotenv(override=False)
+
 from fastapi.middleware.cors import CORSMiddleware
 from .api import chat_router, admin_router, test_router
 from .dependencies import lifespan
@@ -1,10 +1,10 @@
 from app.services.chatbot_service import ChatSession
 from app.services.vector_store_service import VectorStoreManager
-from app.services.sql_service import SQLManager
+from app.services.sql_service import SQLManager, SQLConnectionPool
 from app.services.workflow_service import ConversationManager
 from app.services.workflow import NODE_REGISTRY, EDGE_REGISTRY
 from app.services.pipelines import SttService
 from app.services.pipelines import TtsService
 from app.services.pipelines import SttPipeline
 from app.services.pipelines import TtsPipeline
-from app.services.face_service import FaceProcessor
+from app.services.face_service import FaceProcessor, FaceMetrics
@@ -6,22 +6,26 @@ Key Responsibilities:
 - STT and TTS Management: Starts and stops the STT and TTS pipelines for transcription and audio synthesis
 - State Management: Maintains session-specific flags like tts_to_client, user_interrupted, and silence_active.
 - Callbacks: Implements callbacks for STT and TTS events (e.g., partial transcription, final transcription, word timing).
-- Security Monitoring: Runs a background thread to monitor security events and coordinate with the frontend.
+- Security Monitoring: Runs a background task to monitor security events and coordinate with the frontend.
 - Queue Management: Manages audio and message queues for communication between components.
 
 Iteractions:
 - STT Pipeline: Uses the SttPipeline class to handle speech-to-text transcription
 - TTS Pipeline: Uses the TtsPipeline class to handle text-to-speech synthesis
-- Frontend: Sends messages to the client via the message_queue.
+- Frontend: Sends pre-encoded JSON messages to the client via the message_queue.
 - Security Events: Coordinates with the EventHandler in the workflow service for security checks.
 """
 
-import re
+import json
 import time
 import asyncio
-import threading
-from app.services.pipelines import SttPipeline, TtsPipeline
+import logging
+from typing import Optional
+from app.services.pipelines import SttPipeline, TtsPipeline, AudioChunkRing
 from app.models import TimingInfo
+from app.core import MAX_AUDIO_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
 
 
 class ChatSession:
@@ -37,6 +41,9 @@ class ChatSession:
     After shutdown, it automatically cleans up the pipelines (shutting down tasks/threads) and abort worker thread.
     """
 
+    # Partials arriving within this window after a send are merged into the next message
+    PARTIAL_EMIT_INTERVAL_S: float = 0.03
+
     def __init__(
         self,
         stt_pipeline: SttPipeline,
@@ -52,7 +59,7 @@ class ChatSession:
         self.synthesizer_manager = tts_pipeline
 
         self.message_queue = asyncio.Queue()
-        self.audio_chunks = asyncio.Queue()
+        self.audio_chunks = AudioChunkRing(MAX_AUDIO_QUEUE_SIZE)
         self.final_transcription = ""
 
         # Initialize connection-specific state flags here
@@ -77,11 +84,13 @@ class ChatSession:
 
         self.reset_state()  # Call reset to ensure consistency
 
-        self.security_thread = threading.Thread(
-            target=self.__security_event_monitor,
-            name="SecurityEventMonitor",
-            daemon=True,
-        )
+        # Latest partial transcription waiting to be sent, newer partials replace older ones
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.latest_partial: Optional[str] = None
+        self.partial_pending = asyncio.Event()
+        self.partial_sender_task: Optional[asyncio.Task] = None
+
+        self.security_task: Optional[asyncio.Task] = None
         self.security_thread_running = True
 
         self.__setup_callbacks()  # Set up internal callbacks for the session
@@ -93,17 +102,43 @@ class ChatSession:
         # These start functions already check if the pipelines are already running
         self.transcriber_manager.start()
         self.synthesizer_manager.start_threads()  # Start the TTS pipeline threads
-        self.security_thread.start()  # Start the security event monitor thread
 
-    def get_queues(self) -> tuple[asyncio.Queue, asyncio.Queue]:
+        # STT callbacks run in worker threads, they hand partials over through this loop
+        self.loop = asyncio.get_running_loop()
+
+        # Start the security event monitor task
+        if self.security_task is None or self.security_task.done():
+            self.security_thread_running = True
+            self.security_task = self.loop.create_task(self.__security_event_monitor())
+        if self.partial_sender_task is None or self.partial_sender_task.done():
+            self.partial_sender_task = self.loop.create_task(self.__partial_sender())
+
+    def get_queues(self) -> tuple[AudioChunkRing, asyncio.Queue]:
         """
         Returns the audio chunks and message queues for the chat session.
+        Call this once per connection, clear_queues() replaces the queue instances.
 
         Returns:
-            tuple: A tuple containing the audio chunks queue and the message queue.
+            tuple: A tuple containing the audio chunk ring and the message queue.
         """
         return self.audio_chunks, self.message_queue
 
+    def enqueue_message(self, msg_type: str, content):
+        """
+        Queues a message for the client. It is JSON-encoded here, on the producing thread,
+        so the websocket sender only has to write the text frame.
+
+        Args:
+            msg_type (str): The message type handled by the frontend.
+            content: JSON-serializable message content.
+        """
+        payload = json.dumps(
+            {"type": msg_type, "content": content},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self.message_queue.put_nowait((msg_type, payload))
+
     def __setup_callbacks(self):
         """
         Sets up the internal callbacks for the transcriber and synthesizer managers.
@@ -161,53 +196,50 @@ class ChatSession:
         # Keep the abort call related to the audio processor/pipeline manager
         self.synthesizer_manager.abort_generation()
 
-    def __security_event_monitor(self):
+    async def __security_event_monitor(self):
         """
         Unified event monitoring loop for security frontend coordination.
         Checks:
         - do_security_check -> to trigger frontend workflow
         - security_op_completed -> to send QR/PIN
         """
-        print("Chat Session: Starting event monitor thread.")
+        logger.info("Starting event monitor task.")
 
         last_check_sent = False
         event_handler = self.synthesizer_manager.llm.event_handler
 
         while self.security_thread_running:
+            # Block until either flag is raised, the timeout only lets shutdown be noticed
+            if not await asyncio.to_thread(event_handler.any_security_event.wait, 1.0):
+                continue
+            event_handler.any_security_event.clear()
+
             # Trigger security check request
             if event_handler.do_security_check.is_set() and not last_check_sent:
-                print("Chat Session: Triggering security check request to frontend.")
+                logger.info("Triggering security check request to frontend.")
 
-                self.message_queue.put_nowait(
-                    {"type": "security_check_request", "content": ""}
-                )
+                self.enqueue_message("security_check_request", "")
                 last_check_sent = True
 
             # Trigger security op completed to frontend
             if event_handler.security_op_completed.is_set():
-                print(
-                    "Chat Session: Triggering security operation completed to frontend."
-                )
+                logger.info("Triggering security operation completed to frontend.")
 
                 # If not success, the permission data will be None automatically
                 success = event_handler.permission_data != None
 
-                self.message_queue.put_nowait(
+                self.enqueue_message(
+                    "security_op_completed",
                     {
-                        "type": "security_op_completed",
-                        "content": {
-                            "data": event_handler.permission_data,
-                            "success": success,
-                        },
-                    }
+                        "data": event_handler.permission_data,
+                        "success": success,
+                    },
                 )
 
                 # Reset the flags after sending
                 event_handler.reset()
                 last_check_sent = False
-                print("Chat Session: Security state reset for next operation.")
-
-            time.sleep(0.1)  # Avoid busy waiting
+                logger.info("Security state reset for next operation.")
 
     def on_partial(self, text: str):
         """
@@ -224,13 +256,44 @@ class ChatSession:
         )
         self.final_transcription = ""  # Clear final transcription as this is partial
         self.partial_transcription = text
-        self.message_queue.put_nowait({"type": "partial_user_request", "content": text})
 
-    def on_word(self, timing_info: TimingInfo):
-        # Push timing info to client
-        self.message_queue.put_nowait(
-            {"type": "word_timing", "content": timing_info.to_dict()}
-        )
+        # Coalesce: only the most recent partial is sent if the sender falls behind
+        self.__store_partial(text)
+
+    def __store_partial(self, text: Optional[str]):
+        """
+        Replaces the pending partial on the event loop, so a write from the STT thread can't
+        land between the sender's read and clear and get lost.
+        """
+        if self.loop is None:
+            self.latest_partial = text
+        else:
+            self.loop.call_soon_threadsafe(self.__set_partial, text)
+
+    def __set_partial(self, text: Optional[str]):
+        self.latest_partial = text
+        if text is not None:
+            self.partial_pending.set()
+
+    async def __partial_sender(self):
+        """
+        Forwards the latest partial transcription to the message queue whenever one is pending.
+        After a send it waits PARTIAL_EMIT_INTERVAL_S, so a burst of partials reaches the
+        client as one message with the newest text.
+        """
+        while True:
+            await self.partial_pending.wait()
+            self.partial_pending.clear()
+
+            text = self.latest_partial
+            self.latest_partial = None
+            if text is not None:
+                self.enqueue_message("partial_user_request", text)
+                await asyncio.sleep(self.PARTIAL_EMIT_INTERVAL_S)
+
+    def on_word(self, timing_infos: list[TimingInfo]):
+        # Push the timings of a whole synthesized chunk to the client in one message
+        self.enqueue_message("word_timing", [t.to_dict() for t in timing_infos])
 
     def on_potential_sentence(self, text: str):
         """
@@ -241,7 +304,7 @@ class ChatSession:
         Args:
             text: The potential sentence text.
         """
-        print(f"Chat Session: Potential sentence detected: {text}")
+        logger.debug("Potential sentence detected: %s", text)
 
     def on_potential_final(self, text: str):
         """
@@ -252,7 +315,7 @@ class ChatSession:
         Args:
             text: The potential final transcription text.
         """
-        print(f"Chat Session: Potential final transcription detected: {text}")
+        logger.debug("Potential final transcription detected: %s", text)
 
     def on_potential_abort(self):
         """Callback invoked if the STT detects a potential need to abort based on user speech."""
@@ -271,17 +334,20 @@ class ChatSession:
             audio: The raw audio bytes corresponding to the final transcription. (Currently unused)
             text: The transcription text (might be slightly refined in on_final).
         """
-        print("Chat Session: User turn end.")
+        logger.debug("User turn end.")
         self.user_finished_turn = True
+        # Don't let a stale partial follow the final request, cleared on the loop after
+        # any partial still queued there
+        self.__store_partial(None)
         self.user_interrupted = False  # Reset user interruption state
 
         # First block further incoming audio
         if not self.transcriber_manager.interrupted:
-            print("Chat Session: Microphone input interrupted.")
+            logger.debug("Microphone input interrupted.")
             self.transcriber_manager.interrupted = True
             self.interruption_time = time.time()
 
-        print("Chat Session: Releasing TTS stream to client.")
+        logger.debug("Releasing TTS stream to client.")
         self.tts_to_client = True
 
         # Send final user request
@@ -290,9 +356,7 @@ class ChatSession:
             if self.final_transcription
             else self.partial_transcription
         )
-        self.message_queue.put_nowait(
-            {"type": "final_user_request", "content": user_request_content}
-        )
+        self.enqueue_message("final_user_request", user_request_content)
 
         # Access global manager state
         if self.synthesizer_manager.is_valid_gen():
@@ -305,14 +369,9 @@ class ChatSession:
                 self.assistant_answer = (
                     self.synthesizer_manager.running_generation.quick_answer
                 )
-                self.message_queue.put_nowait(
-                    {
-                        "type": "partial_assistant_answer",
-                        "content": self.assistant_answer,
-                    }
-                )
+                self.enqueue_message("partial_assistant_answer", self.assistant_answer)
 
-        print("Chat Session: Adding user request to history.")
+        logger.debug("Adding user request to history.")
 
     def on_final(self, text: str):
         """
@@ -323,13 +382,11 @@ class ChatSession:
         Args:
             txt: The final transcription text.
         """
-        print(f"Chat Session: Final transcription received: {text}")
+        logger.debug("Final transcription received: %s", text)
         if not self.final_transcription:
             self.final_transcription = text
 
-        self.message_queue.put_nowait(
-            {"type": "final_user_request", "content": self.final_transcription}
-        )
+        self.enqueue_message("final_user_request", self.final_transcription)
 
         self.synthesizer_manager.prepare_generation(self.final_transcription)
 
@@ -337,7 +394,7 @@ class ChatSession:
         """
         Triggers the abortion of any ongoing speech generation process.
         """
-        print("Chat Session: Aborting ongoing generation.")
+        logger.debug("Aborting ongoing generation.")
         self.synthesizer_manager.abort_generation()
 
     def on_silence_active(self, silence_active: bool):
@@ -361,14 +418,12 @@ class ChatSession:
         Args:
             text: The partial assistant text.
         """
-        print(f"Chat Session: Partial assistant text received: {text}")
+        logger.debug("Partial assistant text received: %s", text)
         if not self.user_interrupted:
             self.assistant_answer = text
             # Use connection-specific tts_to_client flag
             if self.tts_to_client:
-                self.message_queue.put_nowait(
-                    {"type": "partial_assistant_answer", "content": text}
-                )
+                self.enqueue_message("partial_assistant_answer", text)
 
     def on_recording_start(self):
         """
@@ -378,37 +433,27 @@ class ChatSession:
         TTS streaming, sends stop/interruption messages to the client, aborts ongoing
         generation, sends any final assistant answer generated so far, and resets relevant state.
         """
-        print(
-            f"Chat Session: Recording started. TTS client playing: {self.tts_client_playing}"
+        logger.debug(
+            "Recording started. TTS client playing: %s", self.tts_client_playing
         )
 
         if self.tts_client_playing:
             self.tts_to_client = False  # Stop TTS to client
             self.user_interrupted = True  # Set user interrupted state
-            print(
-                "Chat Session: TTS client is playing, interrupting current TTS streaming."
-            )
+            logger.debug("TTS client is playing, interrupting current TTS streaming.")
 
             # Send final assistant answer if one was generated and not sent
             self.send_final_assistant_answer(forced=True)
 
             self.tts_chunk_sent = False
 
-            self.message_queue.put_nowait(
-                {
-                    "type": "stop_tts",  # Client handles this to mute/ignore
-                    "content": "",
-                }
-            )
+            # Client handles this to mute/ignore
+            self.enqueue_message("stop_tts", "")
 
             self.abort_generations()
 
-            self.message_queue.put_nowait(
-                {  # Tell client to stop playback and clear buffer
-                    "type": "tts_interruption",
-                    "content": "",
-                }
-            )
+            # Tell client to stop playback and clear buffer
+            self.enqueue_message("tts_interruption", "")
 
     def send_final_assistant_answer(self, forced=False):
         """
@@ -434,34 +479,33 @@ class ChatSession:
             # If forced, try using the last known partial answer from this connection
             if forced and self.assistant_answer:
                 final_answer = self.assistant_answer
-                print(
-                    f"Chat Session: Forcing final assistant answer to last known partial: {final_answer}"
+                logger.debug(
+                    "Forcing final assistant answer to last known partial: %s",
+                    final_answer,
                 )
             else:
-                print("Chat Session: No final assistant answer available to send.")
+                logger.debug("No final assistant answer available to send.")
                 return
 
-        print(
-            f"Chat Session: Attempting to send final assistant answer: {final_answer} Sent previously: {self.final_assistant_answer_sent}"
+        logger.debug(
+            "Attempting to send final assistant answer: %s Sent previously: %s",
+            final_answer,
+            self.final_assistant_answer_sent,
         )
 
         if not self.final_assistant_answer_sent and final_answer:
-            cleaned_answer = re.sub(r"[\r\n]+", " ", final_answer)
-            cleaned_answer = re.sub(r"\s+", " ", cleaned_answer).strip()
-            cleaned_answer = cleaned_answer.replace("\\n", " ")
-            cleaned_answer = re.sub(r"\s+", " ", cleaned_answer).strip()
+            # Single pass: literal "\\n" sequences and any whitespace run collapse to one space
+            cleaned_answer = " ".join(final_answer.replace("\\n", " ").split())
 
             if cleaned_answer:  # Ensure it's not empty after cleaning
-                print(f"Chat Session: Final assistant answer sending: {cleaned_answer}")
-                self.message_queue.put_nowait(
-                    {"type": "final_assistant_answer", "content": cleaned_answer}
-                )
+                logger.debug("Final assistant answer sending: %s", cleaned_answer)
+                self.enqueue_message("final_assistant_answer", cleaned_answer)
 
                 self.final_assistant_answer_sent = True
                 self.final_assistant_answer = cleaned_answer
             else:
-                print(
-                    "Chat Session: Final assistant answer was empty after cleaning, not sending."
+                logger.debug(
+                    "Final assistant answer was empty after cleaning, not sending."
                 )
                 self.final_assistant_answer_sent = False
                 self.final_assistant_answer = ""
@@ -481,39 +525,34 @@ class ChatSession:
         # We don't want to clear memory here, as it might be used in the next session
         self.synthesizer_manager.shutdown()
 
-        # Shutdown the security event monitor thread
-        if self.security_thread.is_alive():
-            print("Chat Session: Shutting down security event monitor thread.")
+        # Shutdown the security event monitor task
+        if self.security_task is not None and not self.security_task.done():
+            logger.info("Shutting down security event monitor task.")
             self.security_thread_running = False
-            self.security_thread.join(timeout=5)
-
-            if self.security_thread.is_alive():
-                print(
-                    "Chat Session: Security event monitor thread did not shut down cleanly."
-                )
-            else:
-                print(
-                    "Chat Session: Security event monitor thread shut down successfully."
-                )
+            self.security_task.cancel()
+            self.security_task = None
         else:
-            print(
-                "Chat Session: Security event monitor thread already shut down or not started."
-            )
+            logger.info("Security event monitor task already shut down or not started.")
+
+        if self.partial_sender_task is not None:
+            self.partial_sender_task.cancel()
+            self.partial_sender_task = None
 
         # Clear the queues
         self.clear_queues()
 
-        print("Chat Session: Shutdown complete, all queues cleared.")
+        logger.info("Shutdown complete, all queues cleared.")
 
     def clear_queues(self):
         """
         Clears the message and audio chunk queues.
         This is useful to ensure no stale data remains in the queues.
-        """
-        while not self.message_queue.empty():
-            self.message_queue.get_nowait()
 
-        while not self.audio_chunks.empty():
-            self.audio_chunks.get_nowait()
+        The queues are swapped for fresh ones rather than drained, so consumers must
+        call get_queues() again (once per connection) to get the new references.
+        """
+        self.message_queue = asyncio.Queue()
+        self.audio_chunks = AudioChunkRing(MAX_AUDIO_QUEUE_SIZE)
+        self.latest_partial = None
 
-        print("Chat Session: Queues cleared.")
+        logger.info("Queues cleared.")
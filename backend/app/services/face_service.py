@@ -1,18 +1,27 @@
+import bisect
 import math
-from typing import Any, Dict, Optional
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
 import cv2
 import numpy as np
 import mediapipe as mp
+from numba import njit
 
 # ===================== Config (adjust as needed) =====================
 MAX_FACES = 1
 REFINE = True
 MIN_DET_CONF = 0.5
 MIN_TRK_CONF = 0.5
+MAX_INPUT_DIM = (
+    480  # Larger frames are downscaled before FaceMesh (landmarks are normalized)
+)
 
 # Distance / smoothing
 SCALE_CONST = 2880.62  # your measured constant
 SMOOTH_ALPHA = 0.25  # EMA smoothing
+_ONE_MINUS_SMOOTH = 1.0 - SMOOTH_ALPHA
 FAR_DIST_CM = 60.0  # your baseline calibration distance
 MID_THRESHOLD_CM = FAR_DIST_CM * 0.90
 NEAR_THRESHOLD_CM = FAR_DIST_CM * 0.60
@@ -21,6 +30,12 @@ NEAR_THRESHOLD_CM = FAR_DIST_CM * 0.60
 HX_THR = 0.65
 HY_THR = 0.65
 
+# process_frame `want` flags, select which metric groups are filled in
+WANT_DIST = 1  # eye_span_px, distance_cm, proximity (updates the distance EMA)
+WANT_GAZE = 2  # gaze_dir, looking, hx, hy
+WANT_YAW = 4  # yaw_ratio
+WANT_FULL = WANT_DIST | WANT_GAZE | WANT_YAW
+
 # Head-yaw sanity via eye-width ratio (left_width / right_width)
 YAW_RATIO_MIN = 0.45
 YAW_RATIO_MAX = 2
@@ -40,62 +55,225 @@ LEFT_EYE_TOP = 386
 LEFT_EYE_BOT = 374
 LEFT_IRIS = [469, 470, 471, 472]
 
+# Per-eye gather order used by _eye_offsets: inner, outer, top, bot, iris ring
+# Plain ints, protobuf landmark lists are indexed with Python integers
+_RIGHT_EYE_IDX = (
+    RIGHT_EYE_INNER,
+    RIGHT_EYE_OUTER,
+    RIGHT_EYE_TOP,
+    RIGHT_EYE_BOT,
+    *RIGHT_IRIS,
+)
+_LEFT_EYE_IDX = (
+    LEFT_EYE_INNER,
+    LEFT_EYE_OUTER,
+    LEFT_EYE_TOP,
+    LEFT_EYE_BOT,
+    *LEFT_IRIS,
+)
+# Both eyes in one gather, the outer corners (row 1 of each eye) double as the distance proxy
+_EYES_IDX = _RIGHT_EYE_IDX + _LEFT_EYE_IDX
+# Eye boxes only, for meshes without the iris refinement
+_EYES_BOX_IDX = _RIGHT_EYE_IDX[:4] + _LEFT_EYE_IDX[:4]
+
 
 # =============================== Utils ===============================
 
 
+_PROXIMITY_LABELS = ("UNKNOWN", "NEAR", "MID", "FAR")
+_PROXIMITY_LABELS_ARR = np.array(_PROXIMITY_LABELS)
+_PROXIMITY_BOUNDS = (NEAR_THRESHOLD_CM, MID_THRESHOLD_CM)
+
+
 def proximity_status(dist_cm: Optional[float]) -> str:
     if dist_cm is None:
         return "UNKNOWN"
-    if dist_cm <= NEAR_THRESHOLD_CM:
-        return "NEAR"
-    if dist_cm <= MID_THRESHOLD_CM:
-        return "MID"
-    return "FAR"
+    # <= NEAR -> 0, <= MID -> 1, else 2
+    return _PROXIMITY_LABELS[1 + bisect.bisect_left(_PROXIMITY_BOUNDS, dist_cm)]
 
 
-def _pt(lmk, idx, w, h):
-    p = lmk[idx]
-    return p.x * w, p.y * h
-
+def proximity_status_vec(dist_cm: np.ndarray) -> np.ndarray:
+    """
+    Vectorized proximity_status for many distances at once (NaN marks an unknown distance).
 
-def eye_metrics(lmk, w, h, inner_idx, outer_idx, top_idx, bot_idx, iris_idxs):
-    # Eye geometry
-    ix, iy = _pt(lmk, inner_idx, w, h)
-    ox, oy = _pt(lmk, outer_idx, w, h)
-    tx, ty = _pt(lmk, top_idx, w, h)
-    bx, by = _pt(lmk, bot_idx, w, h)
+    Args:
+        dist_cm (np.ndarray): Distances in cm.
 
-    # Iris center = mean of ring points (robust)
-    iris_xy = np.array([_pt(lmk, i, w, h) for i in iris_idxs], dtype=np.float32)
-    cx, cy = iris_xy.mean(axis=0)
+    Returns:
+        np.ndarray: Array of labels with the same shape as dist_cm.
+    """
+    dist_cm = np.asarray(dist_cm, dtype=np.float64)
+    codes = np.where(
+        np.isnan(dist_cm),
+        0,
+        1 + np.searchsorted(_PROXIMITY_BOUNDS, dist_cm, side="left"),
+    )
+    return _PROXIMITY_LABELS_ARR[codes]
+
+
+def _gather(lmk, idxs) -> np.ndarray:
+    # Normalized coordinates of the given landmarks as an (N, 2) array
+    return np.array([(lmk[i].x, lmk[i].y) for i in idxs])
+
+
+@njit(cache=True)
+def _eye_offsets(pts):
+    # Rows of pts: inner, outer, top, bot corners then the 4 iris ring points (pixels)
+    if pts.shape[0] > 4:
+        # Iris center = mean of ring points (robust)
+        iris_x = 0.25 * (pts[4, 0] + pts[5, 0] + pts[6, 0] + pts[7, 0])
+        iris_y = 0.25 * (pts[4, 1] + pts[5, 1] + pts[6, 1] + pts[7, 1])
+    else:
+        # No iris landmarks: assume the pupil sits at the eye box center
+        iris_x = 0.5 * (pts[0, 0] + pts[1, 0])
+        iris_y = 0.5 * (pts[2, 1] + pts[3, 1])
 
     # Normalize offsets within eye box
-    center_x = 0.5 * (ix + ox)
-    center_y = 0.5 * (ty + by)
-    half_w = 0.5 * abs(ix - ox)
-    half_h = 0.5 * abs(by - ty)
+    half_w = 0.5 * abs(pts[0, 0] - pts[1, 0])
+    half_h = 0.5 * abs(pts[3, 1] - pts[2, 1])
     if half_w < 1e-3 or half_h < 1e-3:
-        return None
+        return 0.0, 0.0, 0.0, False
+
+    hx = (iris_x - 0.5 * (pts[0, 0] + pts[1, 0])) / half_w
+    hy = (iris_y - 0.5 * (pts[2, 1] + pts[3, 1])) / half_h
+    return hx, hy, 2.0 * half_w, True
 
-    hx = (cx - center_x) / half_w
-    hy = (cy - center_y) / half_h
 
-    width_px = abs(ix - ox)
-    return {
-        "hx": float(hx),
-        "hy": float(hy),
-        "width_px": float(width_px),
-    }
+_GAZE_LABELS = ("CENTER", "RIGHT", "LEFT", "DOWN", "UP")
 
 
-def classify_gaze(hx_avg, hy_avg, ax, ay):
-    if ax <= HX_THR and ay <= HY_THR:
-        return "CENTER"
-    if abs(hx_avg) > abs(hy_avg):
-        return "RIGHT" if hx_avg > 0 else "LEFT"
+@njit(cache=True)
+def _face_metrics(pts, n_eye_pts, w, h, bias_hx, bias_hy):
+    """
+    Eye span, gaze offsets, yaw proxy and gaze classification in one compiled call.
+
+    Args:
+        pts (np.ndarray): (2 * n_eye_pts, 2) normalized landmarks, right eye then left eye,
+            scaled to pixels in place.
+        n_eye_pts (int): Rows per eye, 8 with iris landmarks and 4 without.
+        w (int): Frame width in pixels.
+        h (int): Frame height in pixels.
+        bias_hx (float): Horizontal calibration bias.
+        bias_hy (float): Vertical calibration bias.
+
+    Returns:
+        tuple: (eye_span_px, hx_avg, hy_avg, yaw_ratio, gaze_code, looking), gaze_code indexes
+            _GAZE_LABELS and is -1 when an eye box is degenerate.
+    """
+    for i in range(pts.shape[0]):
+        pts[i, 0] *= w
+        pts[i, 1] *= h
+    pts_right = pts[:n_eye_pts]
+    pts_left = pts[n_eye_pts:]
+
+    # Outer corners for distance proxy
+    eye_span_px = math.hypot(
+        pts_left[1, 0] - pts_right[1, 0], pts_left[1, 1] - pts_right[1, 1]
+    )
+
+    hx_r, hy_r, width_r, ok_r = _eye_offsets(pts_right)
+    hx_l, hy_l, width_l, ok_l = _eye_offsets(pts_left)
+    if not (ok_r and ok_l):
+        return eye_span_px, 0.0, 0.0, 0.0, -1, False
+
+    # Head yaw proxy
+    yaw_ratio = (width_l + 1e-6) / (width_r + 1e-6)
+    head_ok = yaw_ratio >= YAW_RATIO_MIN and yaw_ratio <= YAW_RATIO_MAX
+
+    # Average gaze offsets (+ optional bias)
+    hx_avg = 0.5 * (hx_l + hx_r) - bias_hx
+    hy_avg = 0.5 * (hy_l + hy_r) - bias_hy
+    ax, ay = abs(hx_avg), abs(hy_avg)
+
+    eyes_forward = ax <= HX_THR and ay <= HY_THR
+    if eyes_forward:
+        gaze_code = 0
+    elif ax > ay:
+        gaze_code = 1 if hx_avg > 0 else 2
     else:
-        return "DOWN" if hy_avg > 0 else "UP"
+        gaze_code = 3 if hy_avg > 0 else 4
+
+    return eye_span_px, hx_avg, hy_avg, yaw_ratio, gaze_code, eyes_forward and head_ok
+
+
+def _new_face_mesh(refine: bool):
+    return mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=False,
+        max_num_faces=MAX_FACES,
+        refine_landmarks=refine,
+        min_detection_confidence=MIN_DET_CONF,
+        min_tracking_confidence=MIN_TRK_CONF,
+    )
+
+
+def _cuda_available() -> bool:
+    # pip wheels ship the cv2.cuda module without devices, other builds may lack it entirely
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+# Large frames are resized and swapped to RGB on the GPU when OpenCV was built with CUDA
+_USE_CUDA = _cuda_available()
+
+
+@dataclass(slots=True)
+class FaceMetrics:
+    """
+    Per-frame result of FaceProcessor.process_frame.
+    """
+
+    has_face: bool = False
+    distance_cm: Optional[float] = None
+    proximity: str = "UNKNOWN"
+    gaze_dir: str = "—"
+    looking: bool = False
+    hx: Optional[float] = None
+    hy: Optional[float] = None
+    yaw_ratio: Optional[float] = None
+    eye_span_px: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FaceLandmarkerMesh:
+    """
+    Runs MediaPipe's Tasks FaceLandmarker (the TFLite detector + landmark + iris models of
+    face_landmarker.task, XNNPACK on CPU) behind the `process(rgb)` interface of the FaceMesh
+    solution, without the legacy solution graph and its protobuf results.
+    """
+
+    def __init__(self, model_path: str):
+        """
+        Args:
+            model_path (str): Path to the face_landmarker.task bundle.
+        """
+        vision = mp.tasks.vision
+        options = vision.FaceLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=str(model_path)),
+            running_mode=vision.RunningMode.VIDEO,  # Detector only reruns when tracking is lost
+            num_faces=MAX_FACES,
+            min_face_detection_confidence=MIN_DET_CONF,
+            min_face_presence_confidence=MIN_DET_CONF,
+            min_tracking_confidence=MIN_TRK_CONF,
+        )
+        self.landmarker = vision.FaceLandmarker.create_from_options(options)
+        self.last_ts_ms = 0
+
+    def process(self, rgb: np.ndarray) -> SimpleNamespace:
+        # VIDEO mode requires strictly increasing timestamps
+        ts_ms = max(time.monotonic_ns() // 1_000_000, self.last_ts_ms + 1)
+        self.last_ts_ms = ts_ms
+
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        result = self.landmarker.detect_for_video(image, ts_ms)
+        return SimpleNamespace(
+            multi_face_landmarks=[
+                SimpleNamespace(landmark=face) for face in result.face_landmarks
+            ]
+        )
 
 
 # =====================================================================
@@ -109,15 +287,30 @@ class FaceProcessor:
     and 'looking at camera' classification.
     """
 
-    def __init__(self):
+    def __init__(self, mesh: Optional[Any] = None, refine: bool = REFINE):
+        """
+        Args:
+            mesh (Any, optional): Landmark backend exposing MediaPipe's `process(rgb)` interface,
+                e.g. a wrapper around a quantized TFLite interpreter. Defaults to MediaPipe FaceMesh.
+            refine (bool, optional): Precise mode, runs the iris submodel for gaze offsets. The cheap
+                mode skips it, gaze then reads as centered and 'looking' relies on head yaw.
+                Defaults to REFINE. An injected mesh must provide iris landmarks in precise mode.
+        """
         # --- FaceMesh (persistent across frames) ---
-        self.mesh = mp.solutions.face_mesh.FaceMesh(
-            static_image_mode=False,
-            max_num_faces=MAX_FACES,
-            refine_landmarks=REFINE,
-            min_detection_confidence=MIN_DET_CONF,
-            min_tracking_confidence=MIN_TRK_CONF,
-        )
+        # The processor is a process-wide singleton, so one graph is loaded per process
+        self.refine = refine
+        self.mesh = mesh if mesh is not None else _new_face_mesh(refine)
+        self.eyes_idx = _EYES_IDX if refine else _EYES_BOX_IDX
+        self.n_eye_pts = len(self.eyes_idx) // 2
+
+        # Compile the metric kernels now (lifespan builds the processor in a worker thread)
+        # instead of on the first eye-tracking frame, for both the iris and eye-box layouts
+        for n_eye_pts in (8, 4):
+            _face_metrics(np.zeros((2 * n_eye_pts, 2)), n_eye_pts, 1, 1, 0.0, 0.0)
+
+        # RGB frame reused across frames, reallocated only when the frame size changes
+        self.rgb_scratch: Optional[np.ndarray] = None
+        self.gpu_frame: Optional[Any] = None  # cv2.cuda_GpuMat, created on first use
 
         # Distance smoothing
         self.ema_dist: Optional[float] = None
@@ -126,6 +319,8 @@ class FaceProcessor:
         self.gaze_bias_hx: float = 0.0
         self.gaze_bias_hy: float = 0.0
         self.has_gaze_calib: bool = False
+        # Bias actually subtracted per frame, (0, 0) until calibrated
+        self.gaze_bias: Tuple[float, float] = (0.0, 0.0)
 
     # -------------------- Gaze calibration --------------------
     def calibrate_gaze(self, hx: float, hy: float):
@@ -139,100 +334,91 @@ class FaceProcessor:
         self.gaze_bias_hx = hx
         self.gaze_bias_hy = hy
         self.has_gaze_calib = True
+        self.gaze_bias = (hx, hy)
+
+    def __to_small_rgb_cuda(self, frame_bgr: np.ndarray, size: tuple) -> np.ndarray:
+        """
+        Uploads the frame once, resizes and converts it to RGB on the GPU and downloads
+        only the small RGB frame.
+        """
+        if self.gpu_frame is None:
+            self.gpu_frame = cv2.cuda_GpuMat()
+        self.gpu_frame.upload(frame_bgr)
+        small = cv2.cuda.resize(self.gpu_frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cuda.cvtColor(small, cv2.COLOR_BGR2RGB).download()
 
     # -------------------- Eye tracking -----------------------
-    def process_frame(self, frame_bgr: np.ndarray) -> Dict[str, Any]:
+    def process_frame(
+        self, frame_bgr: np.ndarray, want: int = WANT_FULL
+    ) -> FaceMetrics:
         """
         Eye tracking + distance + 'looking at camera' classification.
-        Returns a compact dict with metrics. (No visualization.)
+        Returns a compact FaceMetrics with the metrics. (No visualization.)
+
+        Args:
+            frame_bgr (np.ndarray): BGR frame.
+            want (int, optional): WANT_* flags of the metrics to fill in, the others keep
+                their defaults. Without WANT_DIST the distance EMA is not updated. Defaults to WANT_FULL.
         """
         h, w = frame_bgr.shape[:2]
-        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+
+        # FaceMesh resizes internally anyway, only the original w, h matter for the geometry below
+        scale = MAX_INPUT_DIM / max(h, w)
+        if scale < 1.0 and _USE_CUDA:
+            rgb = self.__to_small_rgb_cuda(
+                frame_bgr, (round(w * scale), round(h * scale))
+            )
+        else:
+            if scale < 1.0:
+                frame_bgr = cv2.resize(
+                    frame_bgr,
+                    (round(w * scale), round(h * scale)),
+                    interpolation=cv2.INTER_AREA,
+                )
+
+            rgb = self.rgb_scratch
+            if rgb is None or rgb.shape != frame_bgr.shape:
+                rgb = self.rgb_scratch = np.empty_like(frame_bgr)
+            cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=rgb)
         rgb.flags.writeable = False
         res = self.mesh.process(rgb)
         rgb.flags.writeable = True
 
-        out = {
-            "has_face": bool(res.multi_face_landmarks),
-            "distance_cm": None,
-            "proximity": "UNKNOWN",
-            "gaze_dir": "—",
-            "looking": False,
-            "hx": None,
-            "hy": None,
-            "yaw_ratio": None,
-            "eye_span_px": None,
-        }
-
-        if not res.multi_face_landmarks:
+        out = FaceMetrics(has_face=bool(res.multi_face_landmarks))
+        if not out.has_face:
             return out
 
         lmk = res.multi_face_landmarks[0].landmark
 
-        # Outer corners for distance proxy
-        rx, ry = int(lmk[RIGHT_EYE_OUTER].x * w), int(lmk[RIGHT_EYE_OUTER].y * h)
-        lx, ly = int(lmk[LEFT_EYE_OUTER].x * w), int(lmk[LEFT_EYE_OUTER].y * h)
-        d_px = math.hypot(lx - rx, ly - ry)
-        out["eye_span_px"] = d_px
-
-        if d_px and SCALE_CONST:
-            dist_raw = SCALE_CONST / d_px
-            self.ema_dist = (
-                dist_raw
-                if self.ema_dist is None
-                else (SMOOTH_ALPHA * dist_raw + (1 - SMOOTH_ALPHA) * self.ema_dist)
-            )
-            out["distance_cm"] = float(self.ema_dist)
-            out["proximity"] = proximity_status(self.ema_dist)
-
-        # Per-eye metrics
-        m_right = eye_metrics(
-            lmk,
-            w,
-            h,
-            RIGHT_EYE_INNER,
-            RIGHT_EYE_OUTER,
-            RIGHT_EYE_TOP,
-            RIGHT_EYE_BOT,
-            RIGHT_IRIS,
-        )
-        m_left = eye_metrics(
-            lmk,
-            w,
-            h,
-            LEFT_EYE_INNER,
-            LEFT_EYE_OUTER,
-            LEFT_EYE_TOP,
-            LEFT_EYE_BOT,
-            LEFT_IRIS,
+        # Eye span, per-eye metrics, yaw proxy and gaze classification in one kernel call
+        bias_hx, bias_hy = self.gaze_bias
+        d_px, hx_avg, hy_avg, yaw_ratio, gaze_code, looking = _face_metrics(
+            _gather(lmk, self.eyes_idx), self.n_eye_pts, w, h, bias_hx, bias_hy
         )
-        if not (m_right and m_left):
-            return out
 
-        # Head yaw proxy
-        yaw_ratio = (m_left["width_px"] + 1e-6) / (m_right["width_px"] + 1e-6)
-        head_ok = YAW_RATIO_MIN <= yaw_ratio <= YAW_RATIO_MAX
-        out["yaw_ratio"] = float(yaw_ratio)
+        # Distance proxy
+        if want & WANT_DIST:
+            out.eye_span_px = d_px
+            if d_px and SCALE_CONST:
+                dist_raw = SCALE_CONST / d_px
+                ema = self.ema_dist
+                ema = (
+                    dist_raw
+                    if ema is None
+                    else (SMOOTH_ALPHA * dist_raw + _ONE_MINUS_SMOOTH * ema)
+                )
+                self.ema_dist = ema
+                out.distance_cm = float(ema)
+                out.proximity = proximity_status(ema)
+
+        if gaze_code < 0:
+            return out
 
-        # Average gaze offsets (+ optional bias)
-        hx_avg = 0.5 * (m_left["hx"] + m_right["hx"]) - (
-            self.gaze_bias_hx if self.has_gaze_calib else 0.0
-        )
-        hy_avg = 0.5 * (m_left["hy"] + m_right["hy"]) - (
-            self.gaze_bias_hy if self.has_gaze_calib else 0.0
-        )
-        ax, ay = abs(hx_avg), abs(hy_avg)
-
-        gaze_dir = classify_gaze(hx_avg, hy_avg, ax, ay)
-        eyes_forward = ax <= HX_THR and ay <= HY_THR
-        looking = eyes_forward and head_ok
-
-        out.update(
-            {
-                "gaze_dir": gaze_dir,
-                "looking": bool(looking),
-                "hx": float(hx_avg),
-                "hy": float(hy_avg),
-            }
-        )
+        if want & WANT_YAW:
+            out.yaw_ratio = float(yaw_ratio)
+        if want & WANT_GAZE:
+            out.gaze_dir = _GAZE_LABELS[gaze_code]
+            out.looking = bool(looking)
+            out.hx = float(hx_avg)
+            out.hy = float(hy_avg)
         return out
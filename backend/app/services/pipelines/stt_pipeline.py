@@ -11,14 +11,56 @@ Key Responsibilities:
 Interactions
 - STT Service: Uses the SttService class to perform the actual transcription.
 - ChatSession: Provides transcription results to the ChatSession class via callbacks.
-- Audio Queue: Processes audio chunks from an asyncio.Queue provided by the ChatSession.
+- Audio Queue: Processes audio chunks from the AudioChunkRing provided by the ChatSession.
 """
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from scipy.signal import resample_poly
+from numba import njit
+from scipy.signal import firwin
 from typing import Optional, Callable
 from app.services.pipelines.stt_service import SttService
+from app.services.pipelines.utils import AudioChunkRing
+
+# Anti-aliasing low-pass for 48kHz -> 16kHz, a 48-tap approximation of the response of
+# resample_poly(x, 1, 3), which designs 61 taps with the same cutoff and Kaiser window.
+# The even tap count adds half a sample of group delay, so the output is not identical.
+# Stored as Q15 fixed point so the filter runs on the int16 samples directly
+_FIR_TAPS = 48
+_FIR_Q15 = np.round(firwin(_FIR_TAPS, 1 / 3, window=("kaiser", 5.0)) * 32767).astype(
+    np.int16
+)
+
+
+@njit(cache=True)
+def _decimate3_int16(x, h, out):
+    # out[i] = sat16(sum_k x[3i + k] * h[k] >> 15), h is symmetric so this is the convolution
+    for i in range(out.shape[0]):
+        base = i * 3
+        acc = 0
+        for k in range(h.shape[0]):
+            acc += np.int32(x[base + k]) * np.int32(h[k])
+        acc = (acc + 16384) >> 15
+        if acc > 32767:
+            acc = 32767
+        elif acc < -32768:
+            acc = -32768
+        out[i] = acc
+
+
+@njit(cache=True)
+def _copy_maxabs(src, dst):
+    # Copies src into dst and returns max(|src|) in the same pass, widened so -32768 stays positive
+    peak = 0
+    for i in range(src.shape[0]):
+        v = np.int32(src[i])
+        dst[i] = v
+        if v < 0:
+            v = -v
+        if v > peak:
+            peak = v
+    return peak
 
 
 class SttPipeline:
@@ -43,10 +85,24 @@ class SttPipeline:
         self.transcriber.on_recording_start_callback = self.__on_recording_start
         self.transcriber.silence_active_callback = self.__silence_active_callback
 
+        # Scratch buffers reused across chunks, grown only when a larger chunk arrives.
+        # resample_buf starts with the input samples carried over from the previous chunk
+        # so the FIR stays continuous across chunks.
+        self.resample_buf: np.ndarray = np.zeros(_FIR_TAPS - 1, dtype=np.int16)
+        self.resample_tail_len: int = _FIR_TAPS - 1
+        self.resample_out: np.ndarray = np.empty(0, dtype=np.int16)
+        self.__warm_kernels()
+
         # Flags
         self.transcription_failed: bool = False
 
         self.transcription_task: Optional[asyncio.Task] = None
+        # Blocking transcribe_loop runs here so it never queues behind other to_thread users
+        self.stt_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="stt-loop"
+        )
+        # Set whenever audio is fed to the transcriber, wakes the transcription loop
+        self.audio_fed = asyncio.Event()
 
         # Callbacks to expose to frontend
         self.realtime_callback: Optional[Callable[[str], None]] = None
@@ -93,12 +149,17 @@ class SttPipeline:
         a flag is set, and this loop terminates. Handles CancelledError separately.
         """
         print("STT Pipeline: Starting transcription loop.")
+        loop = asyncio.get_running_loop()
         while True:
             try:
                 # Run one cycle
-                await asyncio.to_thread(self.transcriber.transcribe_loop)
+                await loop.run_in_executor(
+                    self.stt_executor, self.transcriber.transcribe_loop
+                )
                 # If transcribe_loop returns without error, it means one cycle is complete.
-                await asyncio.sleep(0.1)  # Small delay to prevent busy-waiting
+                # The next utterance needs new audio, so wait for it instead of polling
+                self.audio_fed.clear()
+                await self.audio_fed.wait()
             except asyncio.CancelledError:
                 print("STT Pipeline: Transcription loop cancelled.")
                 break
@@ -113,46 +174,79 @@ class SttPipeline:
 
     def __process_audio_chunk(self, raw_bytes: bytes) -> np.ndarray:
         """
-        Converts raw audio bytes (int16) to a 16kHz 16-bit PCM numpy array.
+        Converts raw audio bytes (int16, 48kHz) to a 16kHz 16-bit PCM numpy array.
 
-        The audio is converted to float32 for accurate resampling and then
-        converted back to int16, clipping values outside the valid range.
+        The audio is low-pass filtered and decimated by 3 in fixed point, keeping the
+        filter history between chunks, and the output saturates to the int16 range.
 
         Args:
             raw_bytes: Raw audio data assumed to be in int16 format.
 
         Returns:
-            A numpy array containing the resampled audio in int16 format at 16kHz.
-            Returns an array of zeros if the input is silent.
+            A numpy array containing the resampled audio in int16 format at 16kHz, backed by
+            a buffer that is reused for the next chunk. Returns zeros if the input is silent.
         """
         raw_audio = np.frombuffer(raw_bytes, dtype=np.int16)
 
-        if np.max(np.abs(raw_audio)) == 0:
-            # Calculate expected length after resampling for silence
-            expected_len = int(np.ceil(len(raw_audio) / self.RESAMPLE_RATIO))
-            return np.zeros(expected_len, dtype=np.int16)
-
-        # Convert to float32 for resampling precision
-        audio_float32 = raw_audio.astype(np.float32)
+        tail_len = self.resample_tail_len
+        total = tail_len + len(raw_audio)
+        if total > len(self.resample_buf):
+            grown = np.empty(total, dtype=np.int16)
+            grown[:tail_len] = self.resample_buf[:tail_len]
+            self.resample_buf = grown
+
+        # Append the chunk behind the tail and probe for silence in the same pass
+        samples = self.resample_buf
+        if _copy_maxabs(raw_audio, samples[tail_len:total]) == 0:
+            # Nothing to filter, the history restarts from silence
+            samples[: _FIR_TAPS - 1] = 0
+            self.resample_tail_len = _FIR_TAPS - 1
+            silence = self.__output_buffer(len(raw_audio) // self.RESAMPLE_RATIO)
+            silence.fill(0)
+            return silence
+
+        out_len = max(0, (total - _FIR_TAPS) // self.RESAMPLE_RATIO + 1)
+        resampled_int16 = self.__output_buffer(out_len)
+        _decimate3_int16(samples[:total], _FIR_Q15, resampled_int16)
+
+        # Move everything from the start of the next output window to the front
+        consumed = out_len * self.RESAMPLE_RATIO
+        self.resample_tail_len = total - consumed
+        samples[: self.resample_tail_len] = samples[consumed:total]
 
-        # Resample using float32 data
-        resampled_float = resample_poly(audio_float32, 1, self.RESAMPLE_RATIO)
+        return resampled_int16
 
-        # Convert back to int16, clipping to ensure validity
-        resampled_int16 = np.clip(resampled_float, -32768, 32767).astype(np.int16)
+    @staticmethod
+    def __warm_kernels():
+        """
+        Compiles the numba kernels now, with the same argument types as a real chunk
+        (read-only frombuffer input), so the first chunk doesn't compile on the event loop.
+        """
+        raw_audio = np.frombuffer(bytes(2 * _FIR_TAPS), dtype=np.int16)
+        samples = np.zeros(2 * _FIR_TAPS, dtype=np.int16)
+        out = np.empty(2 * _FIR_TAPS, dtype=np.int16)
+        _copy_maxabs(raw_audio, samples[:_FIR_TAPS])
+        _decimate3_int16(samples[: 2 * _FIR_TAPS], _FIR_Q15, out[:1])
 
-        return resampled_int16
+    def __output_buffer(self, size: int) -> np.ndarray:
+        """
+        Returns a view of `size` samples over the reusable output buffer, growing it if needed.
+        The view is only valid until the next processed chunk.
+        """
+        if size > len(self.resample_out):
+            self.resample_out = np.empty(size, dtype=np.int16)
+        return self.resample_out[:size]
 
-    async def process_chunk_queue(self, audio_queue: asyncio.Queue) -> None:
+    async def process_chunk_queue(self, audio_queue: AudioChunkRing) -> None:
         """
-        Continuously processes audio chunks received from an asyncio Queue.
+        Continuously processes audio chunks received from the session's audio ring.
 
         Retrieves audio data, processes it using `process_audio_chunk`, and
         feeds the result to the transcriber unless interrupted or the transcription
         task has failed. Stops when `None` is received from the queue or upon error.
 
         Args:
-            audio_queue: An asyncio queue expected to yield dictionaries containing
+            audio_queue: An AudioChunkRing expected to yield dictionaries containing
                          'pcm' (raw audio bytes) or None to terminate.
         """
 
@@ -198,17 +292,35 @@ class SttPipeline:
                     )
                     break  # Stop processing if None is received
 
-                pcm_data = audio_data.get("pcm")
-                processed = self.__process_audio_chunk(pcm_data)
+                # Coalesce chunks that queued up meanwhile into a single resample and feed,
+                # the resampler keeps its history so this matches processing them one by one
+                pcm_chunks = [audio_data.get("pcm")]
+                terminated = False
+                while not audio_queue.empty():
+                    queued = audio_queue.get_nowait()
+                    if queued is None:
+                        terminated = True
+                        break
+                    pcm_chunks.append(queued.get("pcm"))
 
-                if processed.size == 0:
-                    continue  # Skip empty chunks
+                pcm_data = (
+                    pcm_chunks[0] if len(pcm_chunks) == 1 else b"".join(pcm_chunks)
+                )
+                processed = self.__process_audio_chunk(pcm_data)
 
-                # Feed audio only if not interrupted and transcriber should be running
-                if not self.interrupted:
+                # Feed audio only if not empty, not interrupted and transcriber should be running
+                if processed.size and not self.interrupted:
                     # Check failure flag as it might have been set during processing
                     if not self.transcription_failed:
-                        self.transcriber.feed_audio(processed.tobytes())
+                        # The recorder appends the buffer to its own bytearray, no bytes copy needed
+                        self.transcriber.feed_audio(memoryview(processed))
+                        self.audio_fed.set()
+
+                if terminated:
+                    print(
+                        "STT Pipeline: Received termination signal from audio queue, stopping processing."
+                    )
+                    break
             except asyncio.CancelledError:
                 print("STT Pipeline: Audio processing cancelled.")
                 break
@@ -218,13 +330,17 @@ class SttPipeline:
 
         print("STT Pipeline: Stopping audio processing loop.")
 
-    def shutdown(self) -> None:
+    def shutdown(self, hard_shutdown: bool = False) -> None:
         """
         Shuts down the STT pipeline, cancelling any ongoing transcription tasks
+
+        Args:
+            hard_shutdown (bool): Also release the recorder and the transcription thread.
+                                  Otherwise they are kept for the next `start`.
         """
         print("STT Pipeline: Shutting down.")
 
-        self.transcriber.shutdown()
+        self.transcriber.shutdown(hard_shutdown=hard_shutdown)
 
         if self.transcription_task and not self.transcription_task.done():
             print("STT Pipeline: Cancelling transcription task.")
@@ -232,6 +348,10 @@ class SttPipeline:
 
         self.transcription_task = None
 
+        if hard_shutdown:
+            # The recorder is shut down, so a running transcribe_loop returns on its own
+            self.stt_executor.shutdown(wait=False, cancel_futures=True)
+
         print("STT Pipeline: Shutdown complete.")
 
     def start(self) -> None:
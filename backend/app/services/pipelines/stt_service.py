@@ -11,13 +11,19 @@ Key Responsibilities
 Interactions
 - STT Service: Uses the SttService class to perform the actual transcription.
 - ChatSession: Provides transcription results to the ChatSession class via callbacks.
-- Audio Queue: Processes audio chunks from an asyncio.Queue provided by the ChatSession.
+- Audio Queue: Processes audio chunks from the AudioChunkRing provided by the ChatSession.
 """
 
+import logging
+import os
+import queue
 import re
 import time
 import threading
-from typing import Optional, List, Dict, Any, Callable
+from collections import OrderedDict, deque
+from enum import IntEnum
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Optional, List, Dict, Any, Callable, Tuple, Union
 from RealtimeSTT import AudioToTextRecorder
 from app.services.pipelines.utils import TextSimilarity
 from app.core import (
@@ -25,10 +31,37 @@ from app.core import (
     RT_STT_MODEL,
     RT_PROCESSING_PAUSE,
     STT_SILENCE_TIMEMOUT,
+    STT_COMPUTE_TYPE,
     PIPELINE_LATENCY,
     DEVICE,
 )
 
+logger = logging.getLogger(__name__)
+
+# Silence monitors of all SttService instances share these threads
+_MONITOR_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(2, (os.cpu_count() or 1) // 4), thread_name_prefix="stt-monitor"
+)
+
+
+class _State(IntEnum):
+    """
+    Lifecycle of an SttService. STOPPED keeps the recorder loaded, SHUTDOWN released it.
+    """
+
+    STOPPED = 0
+    RUNNING = 1
+    SHUTDOWN = 2
+
+
+# Text normalization for sentence comparison, compiled once
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Same filter as _NON_ALNUM_RE for ASCII text, applied by str.translate without the regex engine
+_ASCII_NON_ALNUM = str.maketrans(
+    {c: None for c in map(chr, range(128)) if not (c.isalnum() or c.isspace())}
+)
+
 
 class SttService:
     """
@@ -46,6 +79,10 @@ class SttService:
     SENTENCE_CACHE_MAX_AGE_MS: float = 0.2
     SENTENCE_CACHE_TRIGGER_COUNT: int = 3
     END_MARKS: List[str] = [".", "!", "?", "。"]
+    # End marks are single characters, so a membership test on the last character suffices
+    END_MARK_SET: frozenset = frozenset(END_MARKS)
+    # Characters removed from the end of a partial, in any order (see __normalize_and_strip)
+    END_STRIP_CHARS: str = "".join(END_MARKS) + " \t\n\r"
     MAX_CACHE_SIZE: int = 100
     MAX_YIELDED_SIZE = 50
 
@@ -55,6 +92,9 @@ class SttService:
         various callbacks for real-time transcription, final transcription, and
         """
         self.text_similarity = TextSimilarity(focus="end", n_words=5)
+        # Compiles the similarity kernel here (lifespan runs this in a worker thread)
+        # rather than on the first partial, where it would hold the GIL
+        self.text_similarity.calculate_similarity("a", "a")
 
         # Callbacks to expose to frontend
         self.realtime_transcription_callback: Optional[Callable[[str], None]] = None
@@ -73,27 +113,35 @@ class SttService:
         # Values
         self.pipeline_latency: float = PIPELINE_LATENCY
         self.realtime_text: Optional[str] = None
-        self.sentence_end_cache: List[Dict[str, Any]] = []
-        self.potential_sentences_yielded: List[Dict[str, Any]] = []
+        # Keyed by the last words of the normalized sentence, oldest first
+        self.sentence_end_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.potential_sentences_yielded: "OrderedDict[str, Dict[str, Any]]" = (
+            OrderedDict()
+        )
         self.stripped_partial_user_text: str = ""
+        # Last raw partial and its stripped form, RealtimeSTT often repeats the same partial
+        # (raw, stripped, normalized), replaced as a whole so readers never see a mix
+        self.last_partial: Tuple[Optional[str], str, str] = (None, "", "")
         self.final_transcription: Optional[str] = None
-        self.shutdown_performed: bool = False
+        self.state: _State = _State.RUNNING
         self.silence_time: float = 0.0
         self.silence_active: bool = False
+        # Wakes the silence monitor whenever silence, recording or partial text state changes
+        self.state_cv = threading.Condition()
+        self.state_version: int = 0
+        # The caches are touched by the partial worker, the monitor and the final callback
+        self.sentence_cache_lock = threading.Lock()
+        # Partials from the recorder thread, handled by the partial worker, None stops it
+        self.partial_queue: "queue.SimpleQueue[Optional[Tuple[str, float]]]" = (
+            queue.SimpleQueue()
+        )
+        self.partial_thread: Optional[threading.Thread] = None
 
         self.recorder: Optional[AudioToTextRecorder] = None
         self.__create_recorder()
-        self.monitor_thread: Optional[threading.Thread] = None
+        self.monitor_future: Optional[Future] = None
         # self.__start_silence_monitor()
-
-    def __is_recorder_recording(self) -> bool:
-        """
-        Checks if the recorder is currently recording.
-
-        Returns:
-            bool: True if the recorder is actively recording audio, False otherwise.
-        """
-        return self.recorder.is_recording
+        self.__start_partial_worker()
 
     def __set_silence(self, silence_active: bool) -> None:
         """
@@ -104,29 +152,40 @@ class SttService:
         """
         if self.silence_active != silence_active:
             self.silence_active = silence_active
-            print(f"STT Service: Silence state changed: {self.silence_active}")
+            logger.debug("Silence state changed: %s", self.silence_active)
             if self.silence_active_callback:
                 self.silence_active_callback(silence_active)
 
-    def __strip_ending_punctuation(self, text: str) -> str:
+    def __notify_state_change(self) -> None:
+        """
+        Wakes the silence monitor so it re-evaluates its timing against the new state.
+        """
+        with self.state_cv:
+            self.state_version += 1
+            self.state_cv.notify_all()
+
+    def __normalize_and_strip(self, text: str) -> Tuple[str, str]:
         """
-        Removes trailing punctuation marks defined in `sentence_end_marks`.
+        Computes both forms of a partial used downstream in one go, remembering the
+        last input since the partial worker and the monitor see the same text repeatedly.
 
-        Removes trailing whitespace first, then iteratively removes any characters
-        from `sentence_end_marks` found at the end of the string.
+        Trailing whitespace and end marks are removed together in a single `rstrip`,
+        so mixed runs such as "?! " are fully stripped. The normalized text is built from
+        that stripped text, which gives the same result as normalizing the whole text as
+        normalization drops the removed characters anyway.
 
         Args:
             text: The input text string.
 
         Returns:
-            The text string with specified trailing punctuation removed.
+            The text with trailing punctuation removed, and its `__normalize_text` form.
         """
-        text = text.rstrip()
-        for char in self.END_MARKS:
-            # Repeatedly strip each punctuation mark in case of multiples (e.g., "!!")
-            while text.endswith(char):
-                text = text.rstrip(char)
-        return text  # Return the stripped text
+        raw, stripped, normalized = self.last_partial
+        if text != raw:
+            stripped = text.rstrip(self.END_STRIP_CHARS)
+            normalized = self.__normalize_text(stripped)
+            self.last_partial = (text, stripped, normalized)
+        return stripped, normalized
 
     def __create_recorder(self) -> None:
         """
@@ -142,21 +201,25 @@ class SttService:
             self.silence_time = (
                 recorder_silence_start if recorder_silence_start else time.time()
             )
-            print(
-                f"STT Service: Silence detected (start_silence_detection called). Silence time set to: {self.silence_time}"
+            logger.debug(
+                "Silence detected (start_silence_detection called). Silence time set to: %s",
+                self.silence_time,
             )
+            self.__notify_state_change()
 
         def stop_silence_detection():
             """Callback triggered when recorder detects end of silence (start of speech)."""
             self.__set_silence(False)
             self.silence_time = 0.0  # Reset silence time
-            print("STT Service: Silence ended (stop_silence_detection called).")
+            logger.debug("Silence ended (stop_silence_detection called).")
+            self.__notify_state_change()
 
         def start_recording():
             """Callback triggered when recorder starts a new recording segment."""
-            print("STT Service: Recording started.")
+            logger.debug("Recording started.")
             self.__set_silence(False)
             self.silence_time = 0.0  # Reset silence time
+            self.__notify_state_change()
             if self.on_recording_start_callback:
                 self.on_recording_start_callback()
 
@@ -165,40 +228,28 @@ class SttService:
             Callback triggered when recorder stops a recording segment, just
             before final transcription might be generated.
             """
-            print("STT Service: Recording stopped.")
+            logger.debug("Recording stopped.")
 
             if self.before_final_sentence_callback:
                 try:
-                    print("STT Service: Triggering before_final_sentence_callback.")
+                    logger.debug("Triggering before_final_sentence_callback.")
                     result = self.before_final_sentence_callback(self.realtime_text)
                     return result if isinstance(result, bool) else False
                 except Exception as e:
-                    print(f"STT Service: Error in before_final_sentence_callback: {e}")
+                    logger.error("Error in before_final_sentence_callback: %s", e)
                     return False
             return False  # Indicate no action taken if callback doesn't exist or doesn't return True
 
         def on_partial(text: Optional[str]) -> None:
-            """Callback triggered for real-time transcription updates."""
+            """
+            Callback triggered for real-time transcription updates. Runs on the recorder's
+            transcription thread, so the processing is handed to the partial worker.
+            """
             if text is None:
                 return
             self.realtime_text = text  # Update the real-time text
-
-            # Detect potential sentence ends based on punctuation stability
-            self.detect_potential_sentence_end(text)
-
-            stripped_partial_user_text_new = self.__strip_ending_punctuation(text)
-
-            if stripped_partial_user_text_new != self.stripped_partial_user_text:
-                self.stripped_partial_user_text = stripped_partial_user_text_new
-                print(
-                    f"STT Service: Partial transcription text: {self.stripped_partial_user_text}"
-                )
-                if self.realtime_transcription_callback:
-                    self.realtime_transcription_callback(text)
-            else:
-                print(
-                    f"STT Service: Partial transcription text (No change after strip): {self.stripped_partial_user_text}"
-                )
+            self.__notify_state_change()
+            self.partial_queue.put((text, time.time()))
 
         self.recorder = AudioToTextRecorder(
             model=MAIN_STT_MODEL,
@@ -223,7 +274,7 @@ class SttService:
             silero_deactivity_detection=True,
             early_transcription_on_silence=0,
             beam_size=3,
-            beam_size_realtime=3,
+            beam_size_realtime=1,  # Partials are replaced by the final transcription
             no_log_file=True,
             # wake_words="jarvis", # Implement later
             # wakeword_backend="pvporcupine", #
@@ -231,11 +282,81 @@ class SttService:
             initial_prompt_realtime="The sky is blue. When the sky... She walked home. Because he... Today is sunny. If only I...",
             faster_whisper_vad_filter=False,
             device=DEVICE,
+            compute_type=STT_COMPUTE_TYPE,
         )
 
+    def __start_partial_worker(self) -> None:
+        """
+        Starts the thread that processes real-time partials queued by `on_partial`,
+        unless it is already running.
+        """
+        if self.partial_thread and self.partial_thread.is_alive():
+            return
+        self.partial_thread = threading.Thread(
+            target=self.__partial_worker, name="stt-partials", daemon=True
+        )
+        self.partial_thread.start()
+
+    def __partial_worker(self) -> None:
+        """
+        Drains the partial queue. Every queued partial goes through sentence end detection
+        with its receive time, so the stability count is unaffected, but only the newest
+        partial of a burst updates the real-time text.
+        """
+        get, get_nowait = self.partial_queue.get, self.partial_queue.get_nowait
+        detect_sentence_end = self.detect_potential_sentence_end
+        process_partial = self.__process_partial
+        while True:
+            batch = [get()]
+            try:
+                while True:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+
+            latest_text = None
+            for item in batch:
+                if item is None:
+                    return
+                text, received_at = item
+                try:
+                    # Detect potential sentence ends based on punctuation stability
+                    detect_sentence_end(text, now=received_at)
+                except Exception as e:
+                    logger.error("Error detecting sentence end: %s", e)
+                latest_text = text
+
+            try:
+                process_partial(latest_text)
+            except Exception as e:
+                logger.error("Error processing partial transcription: %s", e)
+
+    def __process_partial(self, text: str) -> None:
+        """
+        Updates the stripped partial text and forwards changes to the
+        realtime_transcription_callback.
+
+        Args:
+            text: The newest real-time transcription text.
+        """
+        stripped_partial_user_text_new, _ = self.__normalize_and_strip(text)
+
+        if stripped_partial_user_text_new != self.stripped_partial_user_text:
+            self.stripped_partial_user_text = stripped_partial_user_text_new
+            logger.debug(
+                "Partial transcription text: %s", self.stripped_partial_user_text
+            )
+            if self.realtime_transcription_callback:
+                self.realtime_transcription_callback(text)
+        else:
+            logger.debug(
+                "Partial transcription text (No change after strip): %s",
+                self.stripped_partial_user_text,
+            )
+
     def __start_silence_monitor(self) -> None:
         """
-        Starts a background thread to monitor silence duration and trigger
+        Runs a loop on the shared monitor executor to monitor silence duration and trigger
         events like potential sentence end detection, TTS synthesis allowance,
         and potential full transcription ("hot") state changes.
         """
@@ -243,51 +364,48 @@ class SttService:
         def monitor():
             hot = False
 
+            # Constants and bound methods used on every wake-up
+            min_detection_time = self.MIN_POTENTIAL_END_DETECTION_TIME_MS
+            hot_threshold_offset = self.HOT_THRESHOLD_OFFSET_S
+            reserve_time = self.PIPELINE_RESERVE_TIME_MS
+            state_cv = self.state_cv
+            detect_sentence_end = self.detect_potential_sentence_end
+
             # Initialize silence time
             self.silence_time = self.recorder.speech_end_silence_start
 
-            while not self.shutdown_performed:
+            while self.state == _State.RUNNING:
+                with state_cv:
+                    seen_version = self.state_version
                 speech_end_silence_start = self.silence_time
+                recorder = self.recorder
+                # Seconds until the next timing threshold, None to sleep until a state change
+                next_deadline = None
 
                 if (
-                    self.recorder
+                    recorder
                     and speech_end_silence_start is not None
                     and speech_end_silence_start != 0
                 ):
-                    silence_waiting_time = self.recorder.post_speech_silence_duration
+                    silence_waiting_time = recorder.post_speech_silence_duration
                     time_since_silence = time.time() - speech_end_silence_start
 
                     # Calculate latest time pipeline can start without exceeding silence duration
                     latest_pipe_start_time = (
-                        silence_waiting_time
-                        - self.pipeline_latency
-                        - self.PIPELINE_RESERVE_TIME_MS
+                        silence_waiting_time - self.pipeline_latency - reserve_time
                     )
 
-                    # Calculate the target time to trigger potential sentence end detection
-                    potential_sentence_end_time = latest_pipe_start_time
-
-                    # Ensure we don't trigger too early
-                    if (
-                        potential_sentence_end_time
-                        < self.MIN_POTENTIAL_END_DETECTION_TIME_MS
-                    ):
-                        potential_sentence_end_time = (
-                            self.MIN_POTENTIAL_END_DETECTION_TIME_MS
-                        )
+                    # Calculate the target time to trigger potential sentence end detection,
+                    # ensuring we don't trigger too early
+                    potential_sentence_end_time = max(
+                        latest_pipe_start_time, min_detection_time
+                    )
 
-                    # Determine the threshold time to enter hot state
-                    start_hot_condition_time = (
-                        silence_waiting_time - self.HOT_THRESHOLD_OFFSET_S
+                    # Determine the threshold time to enter hot state, ensuring the hot
+                    # condition has a minimum meaningful duration
+                    start_hot_condition_time = max(
+                        silence_waiting_time - hot_threshold_offset, min_detection_time
                     )
-                    # Ensure the hot condition has a minimum meaningful duration
-                    if (
-                        start_hot_condition_time
-                        < self.MIN_POTENTIAL_END_DETECTION_TIME_MS
-                    ):
-                        start_hot_condition_time = (
-                            self.MIN_POTENTIAL_END_DETECTION_TIME_MS
-                        )
 
                     # Trigger actions based on timing
 
@@ -295,10 +413,10 @@ class SttService:
                     if time_since_silence > potential_sentence_end_time:
                         # Check if realtime_text exists before logging/detecting
                         current_text = self.realtime_text or ""
-                        print(
-                            f"STT Service: Potential sentence end detected: {current_text}"
+                        logger.debug(
+                            "Potential sentence end detected: %s", current_text
                         )
-                        self.detect_potential_sentence_end(
+                        detect_sentence_end(
                             current_text, force_yield=True, force_ellipses=True
                         )
 
@@ -306,8 +424,8 @@ class SttService:
                     hot_condition_met = time_since_silence > start_hot_condition_time
                     if hot_condition_met and not hot:
                         hot = True
-                        print(
-                            "STT Service: Hot condition met, potential full transcription allowed."
+                        logger.debug(
+                            "Hot condition met, potential full transcription allowed."
                         )
                         if self.potential_full_transcription_callback:
                             self.potential_full_transcription_callback(
@@ -316,31 +434,47 @@ class SttService:
 
                     elif not hot_condition_met and hot:
                         # Transitioning from Hot to Cold while still in silence period (e.g., silence_waiting_time changed)
-                        if self.__is_recorder_recording():  # Check if still recording
-                            print(
-                                "STT Service: Hot condition ended, potential full transcription disallowed."
+                        if recorder.is_recording:  # Check if still recording
+                            logger.debug(
+                                "Hot condition ended, potential full transcription disallowed."
                             )
                             if self.potential_full_transcription_abort_callback:
                                 self.potential_full_transcription_abort_callback()
                         hot = False
 
+                    # Only thresholds still ahead of us need a timed wake-up
+                    pending = [
+                        threshold - time_since_silence
+                        for threshold in (
+                            potential_sentence_end_time,
+                            start_hot_condition_time,
+                        )
+                        if threshold >= time_since_silence
+                    ]
+                    if pending:
+                        next_deadline = min(pending)
+
                 elif (
                     hot
                 ):  # Exited silence period (speech_end_silence_start is 0 or None)
                     # If we were hot, but silence ended (e.g., new speech started), transition to cold
-                    if self.__is_recorder_recording():  # Check if restarted
-                        print(
-                            "STT Service: Silence ended, transitioning from Hot to Cold state."
+                    if recorder and recorder.is_recording:  # Check if restarted
+                        logger.debug(
+                            "Silence ended, transitioning from Hot to Cold state."
                         )
                         if self.potential_full_transcription_abort_callback:
                             self.potential_full_transcription_abort_callback()
 
                     hot = False
 
-                time.sleep(0.001)  # Prevent busy-waiting
+                with state_cv:
+                    state_cv.wait_for(
+                        lambda: self.state_version != seen_version
+                        or self.state != _State.RUNNING,
+                        timeout=next_deadline,
+                    )
 
-        self.monitor_thread = threading.Thread(target=monitor, daemon=True)
-        # self.monitor_thread.start()
+        self.monitor_future = _MONITOR_EXECUTOR.submit(monitor)
 
     def __normalize_text(self, text: str) -> str:
         """
@@ -355,22 +489,27 @@ class SttService:
             The normalized string.
         """
         text = text.lower()
-        # Remove all non-alphanumeric characters (keeping spaces)
-        text = re.sub(r"[^a-z0-9\s]", "", text)  # Keep spaces for SequenceMatcher
+        # Remove all non-alphanumeric characters (keeping spaces for SequenceMatcher)
+        if text.isascii():
+            text = text.translate(_ASCII_NON_ALNUM)
+        else:
+            text = _NON_ALNUM_RE.sub("", text)
         # Remove extra whitespace and trim
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+        return _WHITESPACE_RE.sub(" ", text).strip()
 
     def __is_the_same(
-        self, text1: str, text2: str, similarity_threshold: float = 0.96
+        self,
+        text1: Union[str, Tuple[str, str]],
+        text2: Union[str, Tuple[str, str]],
+        similarity_threshold: float = 0.96,
     ) -> bool:
         """
         Checks if two text strings are highly similar, focusing on the ending words.
         Uses the internal TextSimilarity instance.
 
         Args:
-            text1: The first text string.
-            text2: The second text string.
+            text1: The first text string, or its `TextSimilarity.prepare` form.
+            text2: The second text string, or its `TextSimilarity.prepare` form.
             similarity_threshold: The minimum similarity score (0 to 1) to consider
                                   the texts the same.
 
@@ -378,9 +517,38 @@ class SttService:
             True if the similarity score exceeds the threshold, False otherwise.
         """
         # Use the dedicated TextSimilarity class instance
-        similarity = self.text_similarity.calculate_similarity(text1, text2)
+        if isinstance(text1, str):
+            text1 = self.text_similarity.prepare(text1)
+        if isinstance(text2, str):
+            text2 = self.text_similarity.prepare(text2)
+        similarity = self.text_similarity.calculate_similarity_prepared(text1, text2)
         return similarity > similarity_threshold
 
+    def __find_similar(
+        self, cache: OrderedDict, key: str, prepared: Tuple[str, str]
+    ) -> Optional[str]:
+        """
+        Looks up a sentence key in one of the sentence caches.
+
+        Exact keys are found by hash. Otherwise only the most recently used entry is
+        compared with `__is_the_same`, which catches a partial that revised its last word.
+
+        Args:
+            cache: The cache to search, its entries hold their prepared text under "prepared".
+            key: The sentence's last words, its `TextSimilarity.prepare` tail.
+            prepared: The sentence prepared by `TextSimilarity.prepare`.
+
+        Returns:
+            The matching key in the cache, or None.
+        """
+        if key in cache:
+            return key
+        if cache:
+            last_key = next(reversed(cache))
+            if self.__is_the_same(cache[last_key]["prepared"], prepared):
+                return last_key
+        return None
+
     def transcribe_loop(self) -> None:
         """
         Sets up the final transcription callback mechanism with the recorder.
@@ -392,16 +560,15 @@ class SttService:
 
         def on_final(text: Optional[str]) -> None:
             if text is None or text == "":
-                print("STT Service: Final transcription is empty, skipping.")
+                logger.debug("Final transcription is empty, skipping.")
                 return
 
             self.final_transcription = text
-            print(
-                f"STT Service: Final transcription received: {self.final_transcription}"
-            )
+            logger.debug("Final transcription received: %s", self.final_transcription)
 
-            self.sentence_end_cache.clear()  # Clear cache on new final transcription
-            self.potential_sentences_yielded.clear()
+            with self.sentence_cache_lock:
+                self.sentence_end_cache.clear()  # Clear cache on new final transcription
+                self.potential_sentences_yielded.clear()
 
             if self.full_transcription_callback:
                 self.full_transcription_callback(text)
@@ -416,14 +583,16 @@ class SttService:
         on previously detected potential sentence ends, useful if processing needs
         to be reset or interrupted externally.
         """
-        self.potential_sentences_yielded.clear()
-        print("STT Service: Aborted generation, cleared potential sentences cache.")
+        with self.sentence_cache_lock:
+            self.potential_sentences_yielded.clear()
+        logger.debug("Aborted generation, cleared potential sentences cache.")
 
     def detect_potential_sentence_end(
         self,
         text: Optional[str],
         force_yield: bool = False,
         force_ellipses: bool = False,
+        now: Optional[float] = None,
     ) -> None:
         """
         Detects potential sentence endings based on ending punctuation and timing stability.
@@ -440,6 +609,7 @@ class SttService:
                          triggering the callback (if text is valid and not already yielded).
             force_ellipses: If True (used with `force_yield`), allows "..." to be
                             considered a sentence end.
+            now: When the text was received, defaults to the current time.
         """
         if not text:
             return
@@ -452,128 +622,170 @@ class SttService:
         if stripped_text_raw.endswith("...") and not force_ellipses:
             return
 
-        now = time.time()
+        if now is None:
+            now = time.time()
 
         # Only proceed if text ends with a standard punctuation mark or if forced
-        ends_with_punctuation = any(
-            stripped_text_raw.endswith(p) for p in self.END_MARKS
-        )
+        ends_with_punctuation = stripped_text_raw[-1] in self.END_MARK_SET
         if not ends_with_punctuation and not force_yield:
             return
 
-        normalized_text = self.__normalize_text(stripped_text_raw)
+        _, normalized_text = self.__normalize_and_strip(text)
         if not normalized_text:
             return
 
-        entry_found = None
-        for entry in self.sentence_end_cache:
-            # Check if the normalized text matches an existing entry
-            if self.__is_the_same(entry["text"], normalized_text):
-                entry_found = entry
-                break
-
-        if entry_found:
-            entry_found["timestamps"].append(now)
-            # Keep only recent timestamps within the max age limit
-            entry_found["timestamps"] = [
-                t
-                for t in entry_found["timestamps"]
-                if now - t <= self.SENTENCE_CACHE_MAX_AGE_MS
-            ]
-        else:
-            # Add new entry
-            entry_found = {"text": normalized_text, "timestamps": [now]}
-            self.sentence_end_cache.append(entry_found)
-
-            # Limit cache size to avoid memory bloat
-            if len(self.sentence_end_cache) > self.MAX_CACHE_SIZE:
-                self.sentence_end_cache.pop(0)
-
-        # Yielding logic
-        should_yield = False
-        if force_yield:
-            should_yield = True
-        elif (
-            ends_with_punctuation
-            and len(entry_found["timestamps"]) >= self.SENTENCE_CACHE_TRIGGER_COUNT
-        ):
-            should_yield = True
-
-        if should_yield:
-            # Check if this text has already been yielded
-            already_yielded = False
-            for yielded_entry in self.potential_sentences_yielded:
-                if self.__is_the_same(yielded_entry["text"], normalized_text):
-                    already_yielded = True
-                    break
-
-            if not already_yielded:
-                self.potential_sentences_yielded.append(
-                    {"text": normalized_text, "timestamp": now}
+        prepared = self.text_similarity.prepare(normalized_text)
+        # Cache key: the last words, the part `__is_the_same` compares. TextSimilarity's
+        # normalization leaves our already normalized text unchanged, so its tail is reused.
+        key = prepared[1]
+        newly_yielded = False
+        with self.sentence_cache_lock:
+            found_key = self.__find_similar(self.sentence_end_cache, key, prepared)
+
+            if found_key is not None:
+                entry_found = self.sentence_end_cache[found_key]
+                self.sentence_end_cache.move_to_end(found_key)
+                timestamps = entry_found["timestamps"]
+                timestamps.append(now)
+                # Keep only recent timestamps within the max age limit
+                while now - timestamps[0] > self.SENTENCE_CACHE_MAX_AGE_MS:
+                    timestamps.popleft()
+            else:
+                # Add new entry
+                # Only the trigger count matters, so a few recent timestamps are enough
+                entry_found = {
+                    "text": normalized_text,
+                    "prepared": prepared,
+                    "timestamps": deque(
+                        [now], maxlen=self.SENTENCE_CACHE_TRIGGER_COUNT + 2
+                    ),
+                }
+                self.sentence_end_cache[key] = entry_found
+
+                # Limit cache size to avoid memory bloat
+                if len(self.sentence_end_cache) > self.MAX_CACHE_SIZE:
+                    self.sentence_end_cache.popitem(last=False)
+
+            # Yielding logic
+            should_yield = False
+            if force_yield:
+                should_yield = True
+            elif (
+                ends_with_punctuation
+                and len(entry_found["timestamps"]) >= self.SENTENCE_CACHE_TRIGGER_COUNT
+            ):
+                should_yield = True
+
+            if should_yield:
+                # Check if this text has already been yielded
+                already_yielded = (
+                    self.__find_similar(self.potential_sentences_yielded, key, prepared)
+                    is not None
                 )
-                # Limit yielded sentences cache size
-                if len(self.potential_sentences_yielded) > self.MAX_YIELDED_SIZE:
-                    self.potential_sentences_yielded.pop(0)
 
-                print(
-                    f"STT Service: Yielding potential sentence end detected: {normalized_text}"
-                )
-                if self.potential_sentence_end_callback:
-                    self.potential_sentence_end_callback(stripped_text_raw)
+                if not already_yielded:
+                    self.potential_sentences_yielded[key] = {
+                        "prepared": prepared,
+                        "timestamp": now,
+                    }
+                    # Limit yielded sentences cache size
+                    if len(self.potential_sentences_yielded) > self.MAX_YIELDED_SIZE:
+                        self.potential_sentences_yielded.popitem(last=False)
+                    newly_yielded = True
+
+        # The callback runs outside the lock, it may call back into this service
+        if newly_yielded:
+            logger.debug(
+                "Yielding potential sentence end detected: %s", normalized_text
+            )
+            if self.potential_sentence_end_callback:
+                self.potential_sentence_end_callback(stripped_text_raw)
 
-    def feed_audio(self, chunk: bytes) -> None:
+    def feed_audio(self, chunk: Union[bytes, bytearray, memoryview]) -> None:
         """
         Feeds an audio chunk to the underlying recorder instance for processing.
 
         Args:
-            chunk: A bytes object containing the raw audio data chunk.
+            chunk: The raw audio data chunk. Buffers such as the pipeline's memoryview
+                   are passed through as is, without a copy to bytes.
         """
-        if not self.shutdown_performed:
-            self.recorder.feed_audio(chunk)
-        else:
-            print("STT Service: Cannot feed audio, service has been shut down.")
+        if self.state != _State.RUNNING:
+            logger.warning("Cannot feed audio, service has been shut down.")
+            return
+        self.recorder.feed_audio(chunk)
 
-    def shutdown(self) -> None:
+    @property
+    def shutdown_performed(self) -> bool:
         """
-        Shuts down the recorder instance, cleans up resources, and prevents
-        further processing. Sets the `shutdown_performed` flag.
+        True while the service is stopped or shut down, fed audio is dropped.
         """
-        if not self.shutdown_performed:
-            print("STT Service: Shutting down.")
-            self.shutdown_performed = True
-            self.recorder.shutdown()  # Shutdown the recorder
-            self.recorder = None
+        return self.state != _State.RUNNING
 
-            # Stop the thread if exists
-            if self.monitor_thread and self.monitor_thread.is_alive():
-                self.monitor_thread.join(timeout=1)
-            else:
-                print("STT Service: No monitor thread to shut down.")
+    def shutdown(self, hard_shutdown: bool = False) -> None:
+        """
+        Stops processing, so fed audio is dropped until `start` is called again.
+
+        By default the recorder is kept alive (its queued audio is discarded) and the
+        service is STOPPED, so a later `start` does not have to reload the Whisper models.
+
+        Args:
+            hard_shutdown: Also shut down the recorder and the partial worker,
+                           used when the application exits. The service is then SHUTDOWN.
+        """
+        if self.state == _State.SHUTDOWN or (
+            self.state == _State.STOPPED and not hard_shutdown
+        ):
+            logger.debug("Shutdown already performed, ignoring subsequent calls.")
+            return
+
+        if self.state == _State.RUNNING:
+            logger.info("Shutting down.")
+            self.state = _State.STOPPED
+            self.__notify_state_change()  # Let the monitor loop exit
+            if not hard_shutdown:
+                self.recorder.clear_audio_queue()  # Drop audio of the paused session
 
-            if self.monitor_thread and self.monitor_thread.is_alive():
-                print("STT Service: Monitor thread did not shut down cleanly.")
+            # Wait for the monitor loop if it is running
+            if self.monitor_future and not self.monitor_future.done():
+                try:
+                    self.monitor_future.result(timeout=1)
+                    logger.debug("Monitor shut down successfully.")
+                except TimeoutError:
+                    logger.warning("Monitor did not shut down cleanly.")
+                except Exception as e:
+                    logger.error("Monitor failed: %s", e)
             else:
-                print("STT Service: Monitor thread shut down successfully.")
+                logger.debug("No monitor to shut down.")
 
-            print("STT Service: Shutdown complete.")
-        else:
-            print("STT Service: Shutdown already performed, ignoring subsequent calls.")
+            logger.info("Shutdown complete.")
+
+        if hard_shutdown:
+            logger.info("Releasing the recorder.")
+            self.state = _State.SHUTDOWN
+            self.recorder.shutdown()  # Shutdown the recorder
+            self.recorder = None
+
+            # Let the partial worker finish what is queued, then exit
+            self.partial_queue.put(None)
+            if self.partial_thread and self.partial_thread.is_alive():
+                self.partial_thread.join(timeout=1)
 
     def start(self) -> None:
         """
-        Starts the service. This include starting the monitor thread and setting flags
+        Starts the service again after `shutdown`: recreates the recorder after a hard
+        shutdown, makes sure the partial worker and the silence monitor run.
         """
-        if self.shutdown_performed or self.shutdown_performed:
-            # If is shutdown, start the service again
-            if not self.recorder:
-                self.__create_recorder()  # Create the recorder if not already created
+        if self.state == _State.RUNNING:
+            logger.debug("Service is already running, skipping.")
+            return
 
-            # Check if the silence monitor is already running
-            if not self.monitor_thread or not self.monitor_thread.is_alive():
-                self.__start_silence_monitor()  # Restart the silence monitor
-                # Start the monitor thread
-                self.monitor_thread.start()
+        if self.state == _State.SHUTDOWN:
+            self.__create_recorder()
+        self.__start_partial_worker()
 
-            self.shutdown_performed = False
-        else:
-            print("STT Service: Service is already running, skipping.")
+        # Set before the monitor starts, its loop runs while the service is RUNNING
+        self.state = _State.RUNNING
+
+        # Check if the silence monitor is already running
+        if not self.monitor_future or self.monitor_future.done():
+            self.__start_silence_monitor()  # Restart the silence monitor
@@ -11,13 +11,112 @@ Interactions
 - TTS Service: Provides audio chunks to the TtsService for buffering and playback
 """
 
+import logging
 import re
 import time
 import threading
-from queue import Queue, Empty
-from typing import Generator, Optional, Union
-from kokoro import KPipeline
-from app.core import DEVICE, SPEED, VOICE, LANG_CODE
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from queue import SimpleQueue, Empty
+from typing import Generator, Optional, Tuple, Union
+import torch
+from kokoro import KModel, KPipeline
+from app.core import DEVICE, SPEED, VOICE, LANG_CODE, TTS_PRECISION
+
+logger = logging.getLogger(__name__)
+
+# Phrase boundaries, compiled once: a sentence end (optionally quoted) or a comma,
+# followed by whitespace or the end of the buffer. Only the marks are matched, a lazy
+# `.+?` prefix would rescan each line from every start while no boundary has arrived.
+_STRONG_MARK_RE = re.compile(r"([.!?][\"']?)(?:\s+|$)")
+_WEAK_MARK_RE = re.compile(r"(,)(?:\s+|$)")
+
+
+@lru_cache(maxsize=4)
+def _load_model(repo_id: str, device: str, int8: bool) -> KModel:
+    """
+    Loads the Kokoro model once per process, every engine and pipeline with the same
+    settings shares it. Inference only reads the weights, so it must not be modified.
+
+    Args:
+        repo_id (str): Hugging Face repository of the model.
+        device (str): Device to load the model on.
+        int8 (bool): Quantize the Linear and LSTM layers dynamically. The vocoder
+            is left in fp32 as it is the most sensitive to precision.
+
+    Returns:
+        KModel: The loaded model, in eval mode.
+    """
+    model = KModel(repo_id=repo_id).to(device).eval()
+    if int8:
+        qconfig = torch.ao.quantization.default_dynamic_qconfig
+        torch.ao.quantization.quantize_dynamic(
+            model,
+            {
+                name: qconfig
+                for name in ("bert", "bert_encoder", "predictor", "text_encoder")
+            },
+            inplace=True,
+        )
+    return model
+
+
+def _find_mark(
+    mark_re: re.Pattern, buffer: str, pos: int, scan_from: int
+) -> Tuple[int, int, int]:
+    """
+    Finds the first mark after `pos` that ends a phrase, that is with some text
+    before it on its own line.
+
+    Args:
+        mark_re (re.Pattern): Pattern of the boundary mark.
+        buffer (str): Text received so far.
+        pos (int): Start of the text not yet turned into phrases.
+        scan_from (int): Where to resume scanning, no boundary starts before it.
+
+    Returns:
+        Tuple[int, int, int]: Start of the phrase, index just past the mark and index
+            just past the whitespace after it, or (-1, -1, -1) if there is none yet.
+    """
+    match = mark_re.search(buffer, max(pos, scan_from))
+    while match:
+        mark = match.start()
+        line_start = max(pos, buffer.rfind("\n", pos, mark) + 1)
+        if mark > line_start:
+            return line_start, match.end(1), match.end()
+        match = mark_re.search(buffer, match.end())
+    return -1, -1, -1
+
+
+def _find_phrase_end(buffer: str, pos: int = 0, scan_from: int = 0) -> Tuple[int, int]:
+    """
+    Finds where the first phrase of the buffer after `pos` ends. Phrases do not
+    span lines, and a sentence end wins over a comma in a phrase starting at the
+    same place.
+
+    Args:
+        buffer (str): Text received so far.
+        pos (int): Start of the text not yet turned into phrases.
+        scan_from (int): Where to resume scanning, no boundary starts before it.
+
+    Returns:
+        Tuple[int, int]: Index just past the phrase text and index just past the
+            whitespace following it, or (-1, -1) if there is no boundary yet.
+    """
+    strong_start, strong_text_end, strong_end = _find_mark(
+        _STRONG_MARK_RE, buffer, pos, scan_from
+    )
+    if strong_start == pos:
+        return strong_text_end, strong_end
+    # A comma can still end a phrase on an earlier line
+    weak_start, weak_text_end, weak_end = _find_mark(
+        _WEAK_MARK_RE, buffer, pos, scan_from
+    )
+    if strong_end >= 0 and (weak_end < 0 or strong_start <= weak_start):
+        return strong_text_end, strong_end
+    return weak_text_end, weak_end
 
 
 class KokoroEngine:
@@ -33,12 +132,18 @@ class KokoroEngine:
     # If this is too long it will cause the engine to wait for too long before flushing unpunctuated text
     # This doesn't seem to always happen, might be depending on the LLM generation as well
     MIN_FLUSH_LEN: int = 8
+    # Phrases synthesized ahead of the one being streamed, each worker gets its own
+    # pipeline (sharing the model) as the G2P front end is not thread-safe
+    SYNTH_WORKERS: int = 2
+    # Upper bound on the text of waiting phrases sent to the pipeline in one call
+    BATCH_MAX_CHARS: int = 512
 
     def __init__(
         self,
         lang_code: str = LANG_CODE,
         voice: str = VOICE,
         speed: float = SPEED,
+        precision: str = TTS_PRECISION,
     ):
         """
         Initialize the Kokoro TTS engine with default parameters.
@@ -48,17 +153,40 @@ class KokoroEngine:
             lang_code (str): Language code for the TTS engine.
             voice (str): Voice to use for synthesis.
             speed (float): Speed of the speech synthesis.
+            precision (str): Inference precision, "fp32", "bf16" or "int8".
         """
-        self.pipeline = KPipeline(lang_code, self.REPO_ID, device=DEVICE)
+        self.__autocast_dtype: Optional[torch.dtype] = None
+        int8 = self.__select_precision(precision)
+        model = _load_model(self.REPO_ID, DEVICE, int8)
+        self.__pipelines = [
+            KPipeline(lang_code, self.REPO_ID, model=model)
+            for _ in range(self.SYNTH_WORKERS)
+        ]
+        self.pipeline = self.__pipelines[0]
+        self.__pinned_voices = set()
+        # Each pipeline also gets its own CUDA stream, so the kernels of consecutive
+        # phrases can overlap on the GPU instead of queueing on the default stream
+        self.__free_pipelines: SimpleQueue = SimpleQueue()
+        for pipeline in self.__pipelines:
+            stream = torch.cuda.Stream() if DEVICE == "cuda" else None
+            self.__free_pipelines.put((pipeline, stream))
+        self.__synth_pool = ThreadPoolExecutor(
+            max_workers=self.SYNTH_WORKERS, thread_name_prefix="tts-synth"
+        )
+        self.__pin_voice(voice)
         self.voice = voice
         self.speed = speed
 
-        self.__playing_lock = threading.Lock()
-        self.__playing = False
+        self.__playing = threading.Event()
         self.on_audio_stream_stop = None
 
         self._stop_event = threading.Event()
-        self._stream_thread: Optional[threading.Thread] = None
+        # Long-lived feeder threads, a second one lets a new utterance start while a
+        # stopped feeder is still waiting on its generator
+        self._feeder_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="kokoro-feeder"
+        )
+        self._stream_future: Optional[Future] = None
 
     def set_speed(self, speed: float):
         """
@@ -68,7 +196,7 @@ class KokoroEngine:
             speed (float): The speed of the speech synthesis.
         """
         self.speed = speed
-        print(f"TTS Engine: Speed set to {self.speed}")
+        logger.info("Speed set to %s", self.speed)
 
     def set_voice(self, voice: str):
         """
@@ -77,19 +205,34 @@ class KokoroEngine:
         Args:
             voice (str): The voice to use for synthesis.
         """
+        self.__pin_voice(voice)
         self.voice = voice
-        print(f"TTS Engine: Voice set to {self.voice}")
+        logger.info("Voice set to %s", self.voice)
+
+    def __pin_voice(self, voice: str):
+        """
+        Loads a voice pack once and keeps it on the device in every pipeline, so the
+        pipeline calls find it there instead of copying it over for each phrase.
+
+        Args:
+            voice (str): The voice to pin, may combine packs as KPipeline allows.
+        """
+        if voice in self.__pinned_voices:
+            return
+        pack = self.pipeline.load_voice(voice).to(DEVICE).contiguous()
+        for pipeline in self.__pipelines:
+            pipeline.voices[voice] = pack
+        self.__pinned_voices.add(voice)
 
     def is_playing(self) -> bool:
         """
         Check if the TTS engine is currently playing audio.
-        This is thread-safe and uses a lock to ensure consistent state.
+        This is thread-safe, reading the event's flag takes no lock.
 
         Returns:
             bool: True if the engine is playing audio, False otherwise.
         """
-        with self.__playing_lock:
-            return self.__playing
+        return self.__playing.is_set()
 
     def __set_playing(self, value: bool):
         """
@@ -98,18 +241,94 @@ class KokoroEngine:
         Args:
             value (bool): True to set the engine as playing, False to stop it.
         """
-        print(f"TTS Engine: Setting playing state to {value}")
-        with self.__playing_lock:
-            self.__playing = value
+        logger.debug("Setting playing state to %s", value)
+        if value:
+            self.__playing.set()
+        else:
+            self.__playing.clear()
+
+    def __select_precision(self, precision: str) -> bool:
+        """
+        Sets up the requested inference precision where the device supports it. bf16
+        runs the pipelines under CUDA autocast, int8 uses a dynamically quantized
+        model on CPU.
+
+        Args:
+            precision (str): "fp32", "bf16" or "int8".
+
+        Returns:
+            bool: True if the int8 model should be used.
+        """
+        if precision == "fp32":
+            return False
+
+        if precision == "bf16":
+            if DEVICE == "cuda" and torch.cuda.is_bf16_supported():
+                self.__autocast_dtype = torch.bfloat16
+                logger.info("Running in bf16")
+            else:
+                logger.warning("bf16 is not supported here, running in fp32")
+            return False
+
+        if precision == "int8":
+            if DEVICE != "cpu":
+                logger.warning("int8 is only used on CPU, running in fp32")
+                return False
+            logger.info("Running in int8")
+            return True
+
+        raise ValueError(f"Unsupported TTS precision: {precision}")
+
+    def __synthesize_phrases(
+        self, text: str, speed: float, voice: str, results: SimpleQueue
+    ):
+        """
+        Synthesizes one or more phrases on a free pipeline, handing each result over
+        as soon as it is ready. Runs on the synthesis pool.
+
+        Args:
+            text (str): Phrases to synthesize, separated by blank lines.
+            speed (float): Speed of the speech synthesis.
+            voice (str): Voice to use for synthesis.
+            results (SimpleQueue): Receives the pipeline results, then None.
+        """
+        pipeline, stream = self.__free_pipelines.get()
+        stream_ctx = torch.cuda.stream(stream) if stream is not None else nullcontext()
+        autocast_ctx = (
+            torch.autocast("cuda", dtype=self.__autocast_dtype)
+            if self.__autocast_dtype is not None
+            else nullcontext()
+        )
+        try:
+            with torch.inference_mode(), stream_ctx, autocast_ctx:
+                for result in pipeline(text, speed=speed, voice=voice):
+                    if self._stop_event.is_set():
+                        break
+                    if stream is not None:
+                        # The audio is read on other streams, wait for it here
+                        stream.synchronize()
+                    results.put(result)
+        finally:
+            self.__free_pipelines.put((pipeline, stream))
+            results.put(None)
 
     def stop(self):
         """
         Stop the TTS synthesis and set the stop event.
         This will interrupt any ongoing synthesis and stop the audio stream.
         """
-        print("Stopping TTS synthesis...")
+        logger.debug("Stopping TTS synthesis...")
         self._stop_event.set()
 
+    def close(self):
+        """
+        Stop any synthesis and release the feeder and synthesis threads.
+        The engine cannot be used afterwards.
+        """
+        self.stop()
+        self._feeder_pool.shutdown(wait=False, cancel_futures=True)
+        self.__synth_pool.shutdown(wait=False, cancel_futures=True)
+
     def synthesize(
         self, text_or_gen: Union[str, Generator[str, None, None]]
     ) -> Generator:
@@ -122,103 +341,215 @@ class KokoroEngine:
         Returns:
             Generator: A generator yielding audio chunks as bytes (or None when done).
         """
-        if isinstance(text_or_gen, str):
-            original_text = text_or_gen
-            print(f"TTS Engine: Synthesizing single string: {text_or_gen}")
-
-            def text_gen():
-                yield original_text
-
-            text_or_gen = text_gen()
+        single_string = isinstance(text_or_gen, str)
+        if single_string:
+            logger.debug("Synthesizing single string: %s", text_or_gen)
+            text_or_gen = (text_or_gen,)
 
-        q = Queue()
-        done = threading.Event()
+        q = SimpleQueue()  # Phrases to synthesize, None once the feeder is done
         self._stop_event.clear()
 
         def feeder():
             buffer = ""
-            sentence_end_re = re.compile(
-                r"(.+?[.!?][\"']?\s+|.+?[.!?][\"']?$|.+?,\s+|.+?,$)"
-            )
+            pos = 0  # Start of the text in buffer not yet turned into phrases
+            scan_from = 0  # Text in buffer before this holds no boundary
+            # Chunks received since the last scan, joined onto buffer only when
+            # there are enough words to look for a phrase
             chunk_buffer = []
+            word_count = 0  # Words in buffer[pos:] and chunk_buffer
+            last_char = ""  # Last character of that text, empty if there is none
             cached = None
-            last_flush_time = time.time()
+            cached_words = 0
+            timeout_ns = int(self.SENTENCE_DETER_TIMEOUT * 1e9)
+            last_flush_ns = time.monotonic_ns()
 
             for chunk in text_or_gen:
                 if self._stop_event.is_set():
                     break
 
-                buffer += chunk
+                # Only the chunk is split, which for token-sized chunks is cheaper
+                # than counting \S+ matches with a regex
+                added = len(chunk.split())
+                if (
+                    added
+                    and last_char
+                    and not last_char.isspace()
+                    and not chunk[0].isspace()
+                ):
+                    added -= 1  # The chunk continues the last word of the text
+                word_count += added
+                if chunk:
+                    last_char = chunk[-1]
                 chunk_buffer.append(chunk)
 
-                if len(buffer.split()) < self.MIN_FLUSH_LEN:
+                if word_count < self.MIN_FLUSH_LEN:
                     continue
 
+                # One copy for all the chunks since the last scan, consumed text
+                # is dropped along the way
+                buffer = buffer[pos:] + "".join(chunk_buffer)
+                chunk_buffer.clear()
+                scan_from = max(0, scan_from - pos)
+                pos = 0
+
                 while True:
-                    match = sentence_end_re.search(buffer)
-                    if not match:
+                    text_end, end = _find_phrase_end(buffer, pos, scan_from)
+                    if end < 0:
+                        # Only a mark (and quote) right at the end can still become a
+                        # boundary, the next scan starts there
+                        scan_from = max(pos, len(buffer) - 2)
                         break
 
-                    end = match.end()
-                    phrase = buffer[:end].strip()
-                    buffer = buffer[end:]
+                    # The phrase already ends on its mark, only the start of the
+                    # stream or text after a bare end of buffer can lead with spaces
+                    phrase = buffer[pos:text_end]
+                    if phrase[0].isspace():
+                        phrase = phrase.lstrip()
+                    pos = end
+                    # Boundaries end on whitespace, so no word straddles the cursor
+                    phrase_words = len(phrase.split())
+                    word_count -= phrase_words
 
                     if cached:
-                        phrase = f"{cached} {phrase}".strip()
+                        phrase = f"{cached} {phrase}"
+                        phrase_words += cached_words
                         cached = None
 
-                    if len(phrase.split()) < self.MIN_FLUSH_LEN:
+                    if phrase_words < self.MIN_FLUSH_LEN:
                         cached = phrase
+                        cached_words = phrase_words
                     else:
                         q.put(phrase)
-                        last_flush_time = time.time()
+                        last_flush_ns = time.monotonic_ns()
+                if pos == len(buffer):
+                    last_char = ""
 
+                # The clock is only read once there is enough text to flush
                 if (
-                    buffer
-                    and time.time() - last_flush_time > self.SENTENCE_DETER_TIMEOUT
+                    pos < len(buffer)
+                    and word_count >= self.MIN_FLUSH_LEN
+                    and time.monotonic_ns() - last_flush_ns > timeout_ns
                 ):
-                    if len(buffer.split()) >= self.MIN_FLUSH_LEN:
-                        if cached:
-                            buffer = f"{cached} {buffer}".strip()
-                            cached = None
-                        q.put(buffer)
-                        buffer = ""
-                        chunk_buffer.clear()
-                        last_flush_time = time.time()
-
+                    rest = buffer[pos:]
+                    if cached:
+                        rest = f"{cached} {rest}".strip()
+                        cached = None
+                    q.put(rest)
+                    buffer = ""
+                    pos = 0
+                    scan_from = 0
+                    word_count = 0
+                    last_char = ""
+                    last_flush_ns = time.monotonic_ns()
+
+            buffer = buffer[pos:] + "".join(chunk_buffer)
             if not self._stop_event.is_set():
                 if cached:
                     buffer = f"{cached} {buffer}".strip()
                 if buffer.strip():
-                    print("Flushing unpunctuated tail:", repr(buffer))
+                    logger.debug("Flushing unpunctuated tail: %r", buffer)
                     q.put(buffer.strip())
-            done.set()
+
+        def run_feeder():
+            # A pooled thread keeps exceptions in its future, so report them here and
+            # always let the streamer know the feeder is done
+            try:
+                feeder()
+            except Exception as e:
+                logger.error("Feeder failed: %s", e)
+            finally:
+                q.put(None)
+
+        # Phrase syntheses in phrase order, each with the queue its results arrive on
+        in_flight: deque[Tuple[Future, SimpleQueue]] = deque()
+        held: Optional[str] = None  # Phrase that did not fit in the last batch
+        feeder_done = False
+
+        def fill_window(block: bool):
+            # Submits queued phrases until the window is full or the queue is empty,
+            # waiting for one only when blocking and nothing is in flight
+            nonlocal feeder_done, held
+            while (held or not feeder_done) and len(in_flight) < self.SYNTH_WORKERS:
+                if held:
+                    phrase, held = held, None
+                else:
+                    try:
+                        if block and not in_flight:
+                            # Returns as soon as a phrase lands, the timeout only
+                            # bounds how long a stop request can go unnoticed
+                            phrase = q.get(timeout=0.1)
+                        else:
+                            phrase = q.get_nowait()
+                    except Empty:
+                        return
+                    if phrase is None:
+                        feeder_done = True
+                        return
+
+                # Phrases already waiting share one pipeline call, which splits
+                # them again on the blank lines
+                batch = [phrase]
+                size = len(phrase)
+                while not feeder_done:
+                    try:
+                        phrase = q.get_nowait()
+                    except Empty:
+                        break
+                    if phrase is None:
+                        feeder_done = True
+                    elif size + len(phrase) > self.BATCH_MAX_CHARS:
+                        held = phrase
+                        break
+                    else:
+                        batch.append(phrase)
+                        size += len(phrase)
+
+                results = SimpleQueue()
+                future = self.__synth_pool.submit(
+                    self.__synthesize_phrases,
+                    "\n\n".join(batch),
+                    self.speed,
+                    self.voice,
+                    results,
+                )
+                in_flight.append((future, results))
 
         def tts_streamer():
             self.__set_playing(True)
             try:
-                while not self._stop_event.is_set() and (
-                    not done.is_set() or not q.empty()
-                ):
-                    try:
-                        phrase = q.get(timeout=0.1)
-                        if self._stop_event.is_set():
+                while not self._stop_event.is_set():
+                    fill_window(block=True)
+                    if not in_flight:
+                        if feeder_done:
                             break
-                        tts_gen = self.pipeline(
-                            phrase, speed=self.speed, voice=self.voice
-                        )
-                        for result in tts_gen:
-                            if self._stop_event.is_set():
-                                break
-                            yield result
-                    except Empty:
                         continue
+
+                    future, results = in_flight.popleft()
+                    # Start the next phrases while this one is synthesized and consumed
+                    fill_window(block=False)
+                    while not self._stop_event.is_set():
+                        try:
+                            result = results.get(timeout=0.1)
+                        except Empty:
+                            fill_window(block=False)
+                            continue
+                        if result is None:
+                            future.result()  # Raises if the synthesis failed
+                            break
+                        yield result
             finally:
+                for future, _ in in_flight:
+                    future.cancel()
                 self.__set_playing(False)
                 if self.on_audio_stream_stop:
                     self.on_audio_stream_stop()
                 yield None
 
-        self._stream_thread = threading.Thread(target=feeder, daemon=True)
-        self._stream_thread.start()
+        if single_string:
+            # The whole text is already here, split it right away so the streamer
+            # finds every phrase queued instead of waiting on a feeder thread
+            self._stream_future = None
+            run_feeder()
+        else:
+            self._stream_future = self._feeder_pool.submit(run_feeder)
         return tts_streamer()
@@ -21,9 +21,17 @@ from typing import Optional, Any, Generator, Callable
 from langchain_core.messages import HumanMessage
 from app.services.pipelines.tts_service import TtsService
 from app.services.workflow_service import ConversationManager
-from app.services.pipelines.utils import TextSimilarity, TextContext
+from app.services.pipelines.utils import (
+    AudioChunkBuffer,
+    TextSimilarity,
+    TextContext,
+)
 from app.models import TimingInfo
 
+# LLM punctuation the TTS engine reads poorly, mapped in one pass. "…" expands to
+# three characters so it is replaced separately.
+_TTS_TRANSLATION = str.maketrans({"—": "-", "“": '"', "”": '"', "‘": "'", "’": "'"})
+
 
 class PipelineRequest:
     """
@@ -38,6 +46,116 @@ class PipelineRequest:
         self.timestamp = time.time()
 
 
+# Pipeline flags, bits of one mask so workers can wait on several at once
+SHUTDOWN = 1 << 0
+GENERATOR_READY = 1 << 1
+LLM_ANSWER_READY = 1 << 2
+QUICK_TTS_DONE = 1 << 3
+STOP_EVERYTHING = 1 << 4
+STOP_LLM_REQUEST = 1 << 5
+STOP_LLM_FINISHED = 1 << 6
+STOP_TTS_QUICK_REQUEST = 1 << 7
+STOP_TTS_QUICK_FINISHED = 1 << 8
+STOP_TTS_FINAL_REQUEST = 1 << 9
+STOP_TTS_FINAL_FINISHED = 1 << 10
+ABORT_COMPLETED = 1 << 11
+ABORT_BLOCK = 1 << 12
+THREAD_STARTED = 1 << 13
+
+
+class _PipelineFlags:
+    """
+    Bitmask of pipeline flags guarded by a single Condition. Replaces a dozen separate
+    Events (each with its own Condition and lock) and lets a worker sleep until any of
+    several flags is set, e.g. its start signal or shutdown, instead of polling.
+    """
+
+    def __init__(self):
+        self.state = 0
+        self.cv = threading.Condition()
+
+    def set(self, mask: int):
+        with self.cv:
+            self.state |= mask
+            self.cv.notify_all()
+
+    def clear(self, mask: int):
+        with self.cv:
+            self.state &= ~mask
+
+    def is_set(self, mask: int) -> bool:
+        return bool(self.state & mask)
+
+    def wait_any(self, mask: int, timeout: Optional[float] = None) -> int:
+        """
+        Blocks until any flag of `mask` is set.
+
+        Args:
+            mask (int): Flags to wait for.
+            timeout (Optional[float]): Seconds to wait at most, None waits forever.
+
+        Returns:
+            int: The flags of `mask` that are set, 0 if the wait timed out.
+        """
+        with self.cv:
+            self.cv.wait_for(lambda: self.state & mask, timeout)
+            return self.state & mask
+
+    def event(self, mask: int) -> "_FlagEvent":
+        return _FlagEvent(self, mask)
+
+
+class _FlagEvent:
+    """
+    View of one flag of a `_PipelineFlags` with the `threading.Event` interface, so the
+    flag can still be handed to code expecting an Event.
+    """
+
+    __slots__ = ("flags", "mask")
+
+    def __init__(self, flags: _PipelineFlags, mask: int):
+        self.flags = flags
+        self.mask = mask
+
+    def set(self):
+        self.flags.set(self.mask)
+
+    def clear(self):
+        self.flags.clear(self.mask)
+
+    def is_set(self) -> bool:
+        return self.flags.is_set(self.mask)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return bool(self.flags.wait_any(self.mask, timeout))
+
+
+class _LazyAttribute:
+    """
+    Creates an instance attribute on first access. The value is stored in the instance
+    dict under the same name, so later accesses skip the descriptor entirely.
+    Generations that abort early never pay for synchronization objects they don't use.
+    """
+
+    # Only taken on first access, so threads racing for it still get one value
+    _lock = threading.Lock()
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with self._lock:
+            value = instance.__dict__.get(self.name)
+            if value is None:
+                value = instance.__dict__[self.name] = self.factory()
+        return value
+
+
 class RunningGeneration:
     """
     Holds the state and resources for a single, ongoing text-to-speech generation process.
@@ -47,6 +165,12 @@ class RunningGeneration:
     queues for audio chunks, and text buffers for partial/complete answers.
     """
 
+    # Created on first use
+    llm_finished_event = _LazyAttribute(threading.Event)
+    audio_chunks = _LazyAttribute(AudioChunkBuffer)
+    tts_quick_finished_event = _LazyAttribute(threading.Event)
+    tts_final_finished_event = _LazyAttribute(threading.Event)
+
     def __init__(self, id: int):
         """
         Initializes a new RunningGeneration instance.
@@ -60,7 +184,6 @@ class RunningGeneration:
 
         self.llm_generator: Optional[Generator] = None
         self.llm_finished: bool = False
-        self.llm_finished_event = threading.Event()
         self.llm_aborted: bool = False
 
         self.quick_answer: str = ""
@@ -71,21 +194,23 @@ class RunningGeneration:
         )
         self.tts_quick_started: bool = False
 
-        self.audio_chunks = Queue()
         self.audio_quick_finished: bool = False
         self.audio_quick_aborted: bool = False
-        self.tts_quick_finished_event = threading.Event()
 
         self.abortion_started: bool = False
 
-        self.tts_final_finished_event = threading.Event()
         self.tts_final_started: bool = False
         self.audio_final_aborted: bool = False
         self.audio_final_finished: bool = False
-        self.final_answer: str = ""
+        # Final answer chunks, joined on read instead of concatenated per chunk
+        self.final_answer_parts: list[str] = []
 
         self.completed: bool = False
 
+    @property
+    def final_answer(self) -> str:
+        return "".join(self.final_answer_parts)
+
 
 class TtsPipeline:
     """
@@ -120,23 +245,26 @@ class TtsPipeline:
         self.requests_queue = Queue()
         self.running_generation: Optional[RunningGeneration] = None
 
-        # Threading events
-        self.shutdown_event = threading.Event()
-        self.generator_ready_event = threading.Event()
-        self.llm_answer_ready_event = threading.Event()
-        self.stop_everything_event = threading.Event()
-        self.stop_llm_request_event = threading.Event()
-        self.stop_llm_finished_event = threading.Event()
-        self.stop_tts_quick_request_event = threading.Event()
-        self.stop_tts_quick_finished_event = threading.Event()
-        self.stop_tts_final_request_event = threading.Event()
-        self.stop_tts_final_finished_event = threading.Event()
-        self.abort_completed_event = threading.Event()
-        self.abort_block_event = threading.Event()
+        # Threading events, views of the bits of one flag mask
+        self.__flags = _PipelineFlags()
+        self.shutdown_event = self.__flags.event(SHUTDOWN)
+        self.generator_ready_event = self.__flags.event(GENERATOR_READY)
+        self.llm_answer_ready_event = self.__flags.event(LLM_ANSWER_READY)
+        self.stop_everything_event = self.__flags.event(STOP_EVERYTHING)
+        self.stop_llm_request_event = self.__flags.event(STOP_LLM_REQUEST)
+        self.stop_llm_finished_event = self.__flags.event(STOP_LLM_FINISHED)
+        self.stop_tts_quick_request_event = self.__flags.event(STOP_TTS_QUICK_REQUEST)
+        self.stop_tts_quick_finished_event = self.__flags.event(STOP_TTS_QUICK_FINISHED)
+        self.stop_tts_final_request_event = self.__flags.event(STOP_TTS_FINAL_REQUEST)
+        self.stop_tts_final_finished_event = self.__flags.event(STOP_TTS_FINAL_FINISHED)
+        self.abort_completed_event = self.__flags.event(ABORT_COMPLETED)
+        self.abort_block_event = self.__flags.event(ABORT_BLOCK)
         self.abort_block_event.set()
         self.check_abort_lock = threading.Lock()
+        # Wakes the final TTS worker
+        self.quick_tts_done_event = self.__flags.event(QUICK_TTS_DONE)
 
-        self.thread_started_event = threading.Event()
+        self.thread_started_event = self.__flags.event(THREAD_STARTED)
 
         # State flags
         self.llm_generation_active = False
@@ -171,7 +299,7 @@ class TtsPipeline:
 
         # Callback function to stream partial LLM responses to the frontend as soon as they are available
         self.on_partial_assistant_text: Optional[Callable[[str], None]] = None
-        self.on_word: Optional[Callable[[TimingInfo], None]] = None
+        self.on_word: Optional[Callable[[list[TimingInfo]], None]] = None
 
     def get_conversation_manager(self) -> ConversationManager:
         """
@@ -224,9 +352,9 @@ class TtsPipeline:
                             continue
 
                 # Drain the queue to get the most recent request
-                while not self.requests_queue.empty():
-                    skipped_request = self.requests_queue.get(False)
-                    request = skipped_request  # Keep the last one
+                latest_request = self.__drain_requests()
+                if latest_request is not None:
+                    request = latest_request  # Keep the last one
 
                 self.abort_block_event.wait()  # Wait for any ongoing abort to finish
 
@@ -251,6 +379,23 @@ class TtsPipeline:
 
         print("Request processor: Worker shutting down...")
 
+    def __drain_requests(self) -> Optional[PipelineRequest]:
+        """
+        Empties `requests_queue` in a single critical section rather than one locked
+        `get` per stale request. Like `get`, it leaves `unfinished_tasks` untouched.
+
+        Returns:
+            Optional[PipelineRequest]: The most recent queued request, None if it was empty.
+        """
+        with self.requests_queue.mutex:
+            pending = self.requests_queue.queue
+            if not pending:
+                return None
+            latest = pending[-1]
+            pending.clear()
+            self.requests_queue.not_full.notify_all()
+        return latest
+
     def __on_first_audio_chunk_synthesize(self):
         """
         Callback triggered when the first audio chunk is synthesized.
@@ -276,14 +421,10 @@ class TtsPipeline:
         Returns:
             The preprocessed text chunk.
         """
-        return (
-            chunk.replace("—", "-")
-            .replace("“", '"')
-            .replace("”", '"')
-            .replace("‘", "'")
-            .replace("’", "'")
-            .replace("…", "...")
-        )
+        # Most LLM chunks are plain ASCII and have nothing to replace
+        if chunk.isascii():
+            return chunk
+        return chunk.translate(_TTS_TRANSLATION).replace("…", "...")
 
     # TODO: Look into this function, it seems to be blocking if it can't find a quick answer
     # Might be coming from text context
@@ -301,8 +442,8 @@ class TtsPipeline:
         print("LLM processor: Worker started.")
 
         while not self.shutdown_event.is_set():
-            ready = self.generator_ready_event.wait(timeout=1)
-            if not ready:
+            # Sleeps until there is a generation or the pipeline shuts down
+            if not self.__flags.wait_any(GENERATOR_READY | SHUTDOWN) & GENERATOR_READY:
                 continue
 
             # Check if aborted while waiting before clearing the ready event
@@ -329,6 +470,7 @@ class TtsPipeline:
             self.llm_generation_active = True
             self.stop_llm_finished_event.clear()
 
+            on_partial = self.on_partial_assistant_text
             try:
                 for chunk in current_gen.llm_generator:
                     # Check for stop before processing the chunk
@@ -354,8 +496,8 @@ class TtsPipeline:
                                 f"LLM processor: Quick answer found for gen {gen_id}: context - {context} | overhang - {overhang}"
                             )
                             current_gen.quick_answer = context
-                            if self.on_partial_assistant_text:
-                                self.on_partial_assistant_text(current_gen.quick_answer)
+                            if on_partial is not None:
+                                on_partial(current_gen.quick_answer)
                             current_gen.quick_answer_overhang = overhang
                             current_gen.quick_answer_provided = True
                             self.llm_answer_ready_event.set()  # Signal TTS quick worker
@@ -378,8 +520,8 @@ class TtsPipeline:
 
                     # Already contains the whole text in the previous loop
                     current_gen.quick_answer_provided = True
-                    if self.on_partial_assistant_text:
-                        self.on_partial_assistant_text(current_gen.quick_answer)
+                    if on_partial is not None:
+                        on_partial(current_gen.quick_answer)
                     self.llm_answer_ready_event.set()  # Signal TTS quick worker
             except Exception as e:
                 print(f"LLM processor: Error during generation for gen {gen_id}: {e}")
@@ -424,7 +566,7 @@ class TtsPipeline:
         Returns:
             bool: True if an abortion was processed (either newly initiated or waited for). False if no active generation was found or the new text was too similar.
         """
-        while self.check_abort_lock:
+        with self.check_abort_lock:
             if self.running_generation:
                 if self.running_generation.abortion_started:
 
@@ -506,8 +648,11 @@ class TtsPipeline:
         print("TTS Quick processor: Worker started.")
 
         while not self.shutdown_event.is_set():
-            ready = self.llm_answer_ready_event.wait(timeout=1)
-            if not ready:
+            # Sleeps until there is a quick answer or the pipeline shuts down
+            if (
+                not self.__flags.wait_any(LLM_ANSWER_READY | SHUTDOWN)
+                & LLM_ANSWER_READY
+            ):
                 continue
 
             # Check if aborted while waiting before clearing the ready event
@@ -596,12 +741,13 @@ class TtsPipeline:
                     current_gen.tts_quick_finished_event.set()  # Signal natural completion
 
                 current_gen.audio_quick_finished = True
+                self.quick_tts_done_event.set()  # Hand over to the final TTS worker
 
     def __tts_final_inference_worker(self):
         """
         Worker thread that handles TTS synthesis for the 'final answer'.
-        Continuously checks the `running_generation`. It waits until the 'quick' TTS
-        phase (`tts_quick_started` and `audio_quick_finished`) is complete and was not
+        Waits for `quick_tts_done_event`, then checks the `running_generation`. It requires
+        the 'quick' TTS phase (`tts_quick_started` and `audio_quick_finished`) to be complete and not
         aborted (`audio_quick_aborted`). It also requires that a `quick_answer` was
         actually identified (`quick_answer_provided`).
 
@@ -616,10 +762,13 @@ class TtsPipeline:
         print("TTS Final processor: Worker started")
 
         while not self.shutdown_event.is_set():
+            # Sleep until the quick worker finishes a synthesis instead of polling
+            if not self.__flags.wait_any(QUICK_TTS_DONE | SHUTDOWN) & QUICK_TTS_DONE:
+                continue
+            self.quick_tts_done_event.clear()
             current_gen = self.running_generation
-            time.sleep(0.1)  # Prevent tight spinning while idle
 
-            # Wait for prerequesites to be met
+            # Check prerequesites are met
             if not current_gen:
                 continue  # No active generation
             if current_gen.tts_final_started:
@@ -654,21 +803,24 @@ class TtsPipeline:
                 """
                 Yield remaining text chunks for final TTS synthesis.
                 """
+                # The quick answer is settled by now, only the final parts grow
+                on_partial = self.on_partial_assistant_text
+                quick_answer = current_gen.quick_answer
+                final_parts = current_gen.final_answer_parts
+
                 # Get overhang first
                 if current_gen.quick_answer_overhang:
                     preprocessed_overhang = self.__preprocess_chunk(
                         current_gen.quick_answer_overhang
                     )
-                    current_gen.final_answer += preprocessed_overhang
+                    final_parts.append(preprocessed_overhang)
 
-                    if self.on_partial_assistant_text:
+                    if on_partial is not None:
                         print(
                             f"TTS Final processor: Yielding quick answer overhang for gen {gen_id}"
                         )
                         try:
-                            self.on_partial_assistant_text(
-                                current_gen.quick_answer + current_gen.final_answer
-                            )
+                            on_partial(quick_answer + "".join(final_parts))
                         except Exception as e:
                             print(
                                 f"TTS Final processor: Error in on_partial_assistant_text overhang callback: {e}"
@@ -691,13 +843,11 @@ class TtsPipeline:
                             break
 
                         preprocessed_chunk = self.__preprocess_chunk(chunk)
-                        current_gen.final_answer += preprocessed_chunk
+                        final_parts.append(preprocessed_chunk)
 
-                        if self.on_partial_assistant_text:
+                        if on_partial is not None:
                             try:
-                                self.on_partial_assistant_text(
-                                    current_gen.quick_answer + current_gen.final_answer
-                                )
+                                on_partial(quick_answer + "".join(final_parts))
                             except Exception as e:
                                 print(
                                     f"TTS Final processor: Error in on_partial_assistant_text callback: {e}"
@@ -16,20 +16,20 @@ Interactions
 import time
 import asyncio
 import threading
-from queue import Queue
 from typing import Callable, Generator, Optional
 import numpy as np
 import torch
 from scipy.signal import resample_poly
 from app.core import SAMPLE_RATE, BYTES_PER_SAMPLE
 from app.services.pipelines.tts_engine import KokoroEngine
+from app.services.pipelines.utils import AudioChunkBuffer
 from app.models import TimingInfo
 
 
 class BufferManager:
     def __init__(
         self,
-        chunk_queue: Queue,
+        chunk_queue: AudioChunkBuffer,
         stop_event: threading.Event,
         sample_rate: int,
         bytes_per_sample: int,
@@ -39,7 +39,7 @@ class BufferManager:
         BufferManager for managing audio chunks and ensuring smooth playback.
 
         Args:
-            chunk_queue (Queue): Queue to hold audio chunks for playback.
+            chunk_queue (AudioChunkBuffer): Buffer to hold audio chunks for playback.
             stop_event (threading.Event): Event to signal when processing should stop.
             sample_rate (int): Sample rate of the audio.
             bytes_per_sample (int): Number of bytes per sample in the audio data.
@@ -149,7 +149,11 @@ class TtsService:
         self.engine = KokoroEngine()
 
         # Optional external callbacks to expose
-        self.on_word_callback: Optional[Callable[[TimingInfo], None]] = None
+        self.on_word_callback: Optional[Callable[[list[TimingInfo]], None]] = None
+
+        # PCM scratch array per synthesis thread, the quick and final workers convert
+        # audio at the same time
+        self.__scratch = threading.local()
 
         self.__prewarm()
 
@@ -164,14 +168,14 @@ class TtsService:
         print("TTS engine prewarmed successfully.")
 
     def synthesize_text(
-        self, text: str, audio_chunks: Queue, stop_event: threading.Event
+        self, text: str, audio_chunks: AudioChunkBuffer, stop_event: threading.Event
     ) -> bool:
         """
         Synthesize audio from a given text string and manage the audio chunks.
 
         Args:
             text (str): Text to synthesize.
-            audio_chunks (Queue): Queue to hold audio chunks for playback.
+            audio_chunks (AudioChunkBuffer): Buffer to hold audio chunks for playback.
             stop_event (threading.Event): Event to signal when processing should stop.
 
         Returns:
@@ -202,19 +206,7 @@ class TtsService:
                 buffer_manager.process_chunk(pcm_bytes)
 
             if hasattr(chunk, "tokens") and self.on_word_callback:
-                for token in chunk.tokens:
-                    if hasattr(token, "start_ts") and hasattr(token, "end_ts"):
-                        timing = TimingInfo(
-                            grapheme=token.text,
-                            phoneme=token.phonemes,
-                            start=token.start_ts,
-                            end=token.end_ts,
-                        )
-                        self.on_word_callback(timing)
-                    else:
-                        print(
-                            f"TTS Service: Skipping token with missing timing info: {token.text}"
-                        )
+                self.__emit_word_timings(chunk.tokens)
 
         if not stop_event.is_set():
             buffer_manager.flush()
@@ -222,27 +214,58 @@ class TtsService:
         self.finished_event.set()
         return True
 
+    def __emit_word_timings(self, tokens):
+        """
+        Sends the word timings of one synthesized chunk to on_word_callback in a single call.
+        """
+        timings = []
+        for token in tokens:
+            if hasattr(token, "start_ts") and hasattr(token, "end_ts"):
+                timings.append(
+                    TimingInfo(
+                        grapheme=token.text,
+                        phoneme=token.phonemes,
+                        start=token.start_ts,
+                        end=token.end_ts,
+                    )
+                )
+            else:
+                print(
+                    f"TTS Service: Skipping token with missing timing info: {token.text}"
+                )
+
+        if timings:
+            self.on_word_callback(timings)
+
     def __convert_tensor_to_pcm_bytes(self, tensor: torch.Tensor) -> bytes:
         """
         Converts a float32 torch.Tensor or numpy array [-1, 1] to 16-bit PCM bytes.
         """
         if isinstance(tensor, torch.Tensor):
-            tensor = tensor.detach().cpu().numpy()
+            tensor = tensor.detach().cpu().float().numpy()  # Autocast can give bf16
 
         if not isinstance(tensor, np.ndarray):
             raise ValueError("Expected torch.Tensor or np.ndarray")
 
-        tensor = np.clip(tensor, -1.0, 1.0)  # Safety clip
-
         upsampled = resample_poly(tensor, up=2, down=1)
 
-        int16 = (upsampled * 32767).astype(np.int16)
-        return int16.tobytes()
+        # Scale and saturate in place, also catches the filter overshooting [-1, 1]
+        upsampled *= 32767
+        np.clip(upsampled, -32768, 32767, out=upsampled)
+
+        # Cast into the reused scratch array, only the returned bytes are allocated
+        pcm = getattr(self.__scratch, "pcm", None)
+        if pcm is None or len(pcm) < len(upsampled):
+            pcm = np.empty(len(upsampled), dtype=np.int16)
+            self.__scratch.pcm = pcm
+        pcm = pcm[: len(upsampled)]
+        np.copyto(pcm, upsampled, casting="unsafe")
+        return pcm.tobytes()
 
     def synthesize_generator(
         self,
         generator: Generator[str, None, None],
-        audio_chunks: Queue,
+        audio_chunks: AudioChunkBuffer,
         stop_event: threading.Event,
     ) -> bool:
         """
@@ -250,7 +273,7 @@ class TtsService:
 
         Args:
             generator (Generator[str, None, None]): Generator yielding text strings.
-            audio_chunks (Queue): Queue to hold audio chunks for playback.
+            audio_chunks (AudioChunkBuffer): Buffer to hold audio chunks for playback.
             stop_event (threading.Event): Event to signal when processing should stop.
 
         Returns:
@@ -281,19 +304,7 @@ class TtsService:
                 buffer_manager.process_chunk(pcm_bytes)
 
             if hasattr(chunk, "tokens") and self.on_word_callback:
-                for token in chunk.tokens:
-                    if hasattr(token, "start_ts") and hasattr(token, "end_ts"):
-                        timing = TimingInfo(
-                            grapheme=token.text,
-                            phoneme=token.phonemes,
-                            start=token.start_ts,
-                            end=token.end_ts,
-                        )
-                        self.on_word_callback(timing)
-                    else:
-                        print(
-                            f"TTS Service: Skipping token with missing timing info: {token.text}"
-                        )
+                self.__emit_word_timings(chunk.tokens)
 
         if not stop_event.is_set():
             buffer_manager.flush()
@@ -1,9 +1,85 @@
 import re
+import time
 import base64
+import asyncio
+import threading
+from collections import deque
+from queue import Empty
 import numpy as np
+from numba import njit
 from scipy.signal import resample_poly
-from difflib import SequenceMatcher
-from typing import Optional, Set, Tuple
+from typing import Any, Optional, Set, Tuple
+
+
+@njit(cache=True)
+def _longest_match(a, b, alo, ahi, blo, bhi, prev, cur):
+    # Longest common block of a[alo:ahi] and b[blo:bhi], ties resolved like difflib
+    # (first block by end position in a, then in b). prev/cur hold run lengths at j + 1.
+    besti, bestj, bestsize = alo, blo, 0
+    for j in range(blo, bhi + 1):
+        prev[j] = 0
+    cur[blo] = 0
+    for i in range(alo, ahi):
+        for j in range(blo, bhi):
+            if a[i] == b[j]:
+                k = prev[j] + 1
+                cur[j + 1] = k
+                if k > bestsize:
+                    besti, bestj, bestsize = i - k + 1, j - k + 1, k
+            else:
+                cur[j + 1] = 0
+        for j in range(blo + 1, bhi + 1):
+            prev[j] = cur[j]
+    return besti, bestj, bestsize
+
+
+@njit(cache=True)
+def _matching_ratio(a, b):
+    """
+    Compiled equivalent of `difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()`.
+
+    Args:
+        a (np.ndarray): Code points of the first string.
+        b (np.ndarray): Code points of the second string.
+
+    Returns:
+        float: 2 * matched characters / total characters, 1.0 for two empty strings.
+    """
+    la, lb = a.shape[0], b.shape[0]
+    if la + lb == 0:
+        return 1.0
+    prev = np.zeros(lb + 1, np.int64)
+    cur = np.zeros(lb + 1, np.int64)
+    # Pending (alo, ahi, blo, bhi) ranges, each matched block adds at most one net entry
+    stack = np.empty((2 * min(la, lb) + 2, 4), np.int64)
+    stack[0, 0], stack[0, 1], stack[0, 2], stack[0, 3] = 0, la, 0, lb
+    top = 1
+    matches = 0
+    while top > 0:
+        top -= 1
+        alo, ahi, blo, bhi = stack[top, 0], stack[top, 1], stack[top, 2], stack[top, 3]
+        i, j, k = _longest_match(a, b, alo, ahi, blo, bhi, prev, cur)
+        if k:
+            matches += k
+            if alo < i and blo < j:
+                stack[top, 0], stack[top, 1] = alo, i
+                stack[top, 2], stack[top, 3] = blo, j
+                top += 1
+            if i + k < ahi and j + k < bhi:
+                stack[top, 0], stack[top, 1] = i + k, ahi
+                stack[top, 2], stack[top, 3] = j + k, bhi
+                top += 1
+    return 2.0 * matches / (la + lb)
+
+
+def _sequence_ratio(text1: str, text2: str) -> float:
+    """
+    Character similarity ratio of two strings, as `difflib.SequenceMatcher` computes it.
+    """
+    return _matching_ratio(
+        np.frombuffer(text1.encode("utf-32-le"), dtype=np.uint32),
+        np.frombuffer(text2.encode("utf-32-le"), dtype=np.uint32),
+    )
 
 
 class TextContext:
@@ -92,10 +168,11 @@ class TextSimilarity:
     Compares two text strings and calculates their similarity ratio.
 
     This class provides methods to calculate the similarity between two texts
-    using `difflib.SequenceMatcher`. It supports different comparison strategies:
-    comparing the full texts, focusing only on the last few words, or using a
-    weighted average of both overall and end-focused similarity. Texts are
-    normalized (lowercase, punctuation removed) before comparison.
+    using the `difflib.SequenceMatcher` ratio, compiled with numba. It supports
+    different comparison strategies: comparing the full texts, focusing only on
+    the last few words, or using a weighted average of both overall and
+    end-focused similarity. Texts are normalized (lowercase, punctuation removed)
+    before comparison.
 
     Attributes:
         similarity_threshold (float): The minimum similarity ratio (0.0 to 1.0)
@@ -193,11 +270,25 @@ class TextSimilarity:
         last_words_segment = words[-self.n_words :]
         return " ".join(last_words_segment)
 
+    def prepare(self, text: str) -> Tuple[str, str]:
+        """
+        Normalizes a text once so it can be compared many times.
+
+        Args:
+            text: The raw text string.
+
+        Returns:
+            A tuple of the normalized text and its last `n_words`, as used by
+            `calculate_similarity_prepared`.
+        """
+        normalized_text = self.__normalize_text(text)
+        return normalized_text, self.__get_last_n_words_text(normalized_text)
+
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
         Calculates the similarity ratio between two texts based on the configuration.
 
-        Normalizes both input texts, then calculates similarity using `difflib.SequenceMatcher`
+        Normalizes both input texts, then calculates similarity using the `difflib.SequenceMatcher` ratio
         according to the `focus` strategy ('overall', 'end', or 'weighted').
         Handles empty strings appropriately after normalization.
 
@@ -214,37 +305,45 @@ class TextSimilarity:
             RuntimeError: If the instance's `focus` attribute has an invalid value
                           (should not happen due to __init__ validation).
         """
-        norm_text1 = self.__normalize_text(text1)
-        norm_text2 = self.__normalize_text(text2)
+        return self.calculate_similarity_prepared(
+            self.prepare(text1), self.prepare(text2)
+        )
+
+    def calculate_similarity_prepared(
+        self, prepared1: Tuple[str, str], prepared2: Tuple[str, str]
+    ) -> float:
+        """
+        Same as `calculate_similarity` for texts already passed through `prepare`,
+        so callers comparing against cached texts skip the normalization.
+
+        Args:
+            prepared1: The first text, as returned by `prepare`.
+            prepared2: The second text, as returned by `prepare`.
+
+        Returns:
+            A float between 0.0 and 1.0 representing the calculated similarity ratio.
+
+        Raises:
+            RuntimeError: If the instance's `focus` attribute has an invalid value.
+        """
+        norm_text1, end_text1 = prepared1
+        norm_text2, end_text2 = prepared2
 
         if not norm_text1 or not norm_text2:
             return 1.0
 
-        # autojunk=False forces detailed comparison, potentially slower but avoids heuristics.
-        matcher = SequenceMatcher(isjunk=None, a=None, b=None, autojunk=False)
-
+        # Compiled SequenceMatcher ratio without autojunk heuristics,
+        # empty strings are handled like difflib (("", "") -> 1.0, ("abc", "") -> 0.0)
         if self.focus == "overall":
-            matcher.set_seqs(norm_text1, norm_text2)
-            return matcher.ratio()
+            return _sequence_ratio(norm_text1, norm_text2)
         elif self.focus == "end":
-            end_text1 = self.__get_last_n_words_text(norm_text1)
-            end_text2 = self.__get_last_n_words_text(norm_text2)
-            # SequenceMatcher handles empty strings correctly (("", "") -> 1.0, ("abc", "") -> 0.0)
-            matcher.set_seqs(end_text1, end_text2)
-            return matcher.ratio()
+            return _sequence_ratio(end_text1, end_text2)
         elif self.focus == "weighted":
             # Calculate overall similarity
-            matcher.set_seqs(norm_text1, norm_text2)
-            sim_overall = matcher.ratio()
+            sim_overall = _sequence_ratio(norm_text1, norm_text2)
 
             # Calculate end similarity
-            end_text1 = self.__get_last_n_words_text(norm_text1)
-            end_text2 = self.__get_last_n_words_text(norm_text2)
-
-            # Reuse the matcher and let SequenceMatcher handle empty end segments
-            # SequenceMatcher handles empty strings correctly (("", "") -> 1.0, ("abc", "") -> 0.0)
-            matcher.set_seqs(end_text1, end_text2)
-            sim_end = matcher.ratio()
+            sim_end = _sequence_ratio(end_text1, end_text2)
 
             weighted_sim = (
                 1 - self.end_weight
@@ -273,3 +372,133 @@ class TextSimilarity:
         """
         similarity = self.calculate_similarity(text1, text2)
         return similarity >= self.similarity_threshold
+
+
+class AudioChunkRing:
+    """
+    Bounded buffer of incoming audio chunks, written by the websocket receiver and
+    drained by the STT pipeline on the same event loop.
+
+    It offers the subset of the `asyncio.Queue` interface the two sides use, but a put
+    is a deque append plus an Event set instead of a queue with getter futures. When the
+    buffer is full the oldest chunk is overwritten, stale audio is the least useful.
+    """
+
+    def __init__(self, maxlen: int):
+        """
+        Initializes an empty ring.
+
+        Args:
+            maxlen (int): Number of chunks kept before the oldest are overwritten.
+        """
+        self.maxlen = maxlen
+        self.chunks: deque = deque(maxlen=maxlen)
+        self.ready = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self.chunks)
+
+    def empty(self) -> bool:
+        return not self.chunks
+
+    def full(self) -> bool:
+        return len(self.chunks) >= self.maxlen
+
+    def put_nowait(self, item: Any) -> None:
+        """
+        Appends a chunk (or None to signal termination), overwriting the oldest when full.
+        """
+        self.chunks.append(item)
+        self.ready.set()
+
+    async def put(self, item: Any) -> None:
+        self.put_nowait(item)
+
+    def get_nowait(self) -> Any:
+        """
+        Raises:
+            asyncio.QueueEmpty: If no chunk is buffered.
+        """
+        try:
+            return self.chunks.popleft()
+        except IndexError:
+            raise asyncio.QueueEmpty from None
+
+    async def get(self) -> Any:
+        """
+        Waits for and returns the oldest buffered chunk.
+        """
+        while not self.chunks:
+            self.ready.clear()
+            await self.ready.wait()
+        return self.chunks.popleft()
+
+
+class AudioChunkBuffer:
+    """
+    Unbounded buffer of synthesized audio chunks, filled by the TTS workers and drained
+    by the websocket sender.
+
+    It offers the subset of the `queue.Queue` interface the two sides use, and
+    `get_nowait` raises `queue.Empty` like before. Appends and pops on a deque are atomic,
+    so only waiting takes a lock, through the Event that flags available chunks.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty buffer.
+        """
+        self.chunks: deque = deque()
+        self.ready = threading.Event()
+
+    def qsize(self) -> int:
+        return len(self.chunks)
+
+    def empty(self) -> bool:
+        return not self.chunks
+
+    def put_nowait(self, item: Any) -> None:
+        """
+        Appends a chunk and flags it for a waiting consumer.
+        """
+        self.chunks.append(item)
+        # Appended first, so a consumer clearing the flag after this check sees the chunk
+        if not self.ready.is_set():
+            self.ready.set()
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        self.put_nowait(item)
+
+    def get_nowait(self) -> Any:
+        """
+        Raises:
+            queue.Empty: If no chunk is buffered.
+        """
+        try:
+            return self.chunks.popleft()
+        except IndexError:
+            raise Empty from None
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """
+        Returns the oldest buffered chunk, waiting for one if asked to.
+
+        Raises:
+            queue.Empty: If no chunk arrived in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self.chunks.popleft()
+            except IndexError:
+                if not block:
+                    raise Empty from None
+            self.ready.clear()
+            if self.chunks:
+                continue
+            if deadline is None:
+                self.ready.wait()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.ready.wait(remaining):
+                raise Empty
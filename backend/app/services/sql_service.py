@@ -29,32 +29,105 @@ Interactions:
 
 import json
 import requests
-from sqlite3 import Connection
+import sqlite3
+import threading
 import hashlib
 import uuid
+from pathlib import Path
+from contextlib import contextmanager
+from queue import SimpleQueue
 from datetime import datetime, timezone
 from app.core import WEBHOOK_CONFIG_PATH
 
 
+class SQLConnectionPool:
+    """
+    A small pool of read-only SQLite connections plus one dedicated writer connection.
+    With WAL enabled, readers run concurrently while writes are serialized behind a lock.
+    """
+
+    def __init__(self, db_path: str, read_size: int = 4):
+        """
+        Open the writer and the read connections.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            read_size (int): Number of read connections in the pool.
+        """
+        # The writer is opened first so the database and WAL files exist for the readers
+        self.writer = self.__connect(db_path)
+        self.writer.execute("PRAGMA journal_mode=WAL")
+        self.write_lock = threading.Lock()
+
+        # Readers are opened read-only at the VFS level. File locking stays on (no nolock=1),
+        # WAL readers rely on it to see a consistent snapshot while the writer commits.
+        read_uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+
+        self.readers = SimpleQueue()
+        for _ in range(read_size):
+            reader = self.__connect(read_uri, uri=True, isolation_level=None)
+            reader.execute("PRAGMA query_only=1")
+            self.readers.put(reader)
+
+    def __connect(self, db_path: str, **kwargs) -> sqlite3.Connection:
+        connection = sqlite3.connect(db_path, check_same_thread=False, **kwargs)
+        connection.row_factory = (
+            sqlite3.Row
+        )  # Enable row factory to return rows as dictionaries
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA mmap_size=268435456")
+        connection.execute("PRAGMA cache_size=-65536")
+        return connection
+
+    @contextmanager
+    def acquire_read(self):
+        """
+        Borrow a read connection, blocking until one is free.
+        """
+        connection = self.readers.get()
+        try:
+            yield connection
+        finally:
+            self.readers.put(connection)
+
+    @contextmanager
+    def acquire_write(self):
+        """
+        Hold the single writer connection. Uncommitted changes are rolled back on error.
+        """
+        with self.write_lock:
+            try:
+                yield self.writer
+            except Exception:
+                self.writer.rollback()
+                raise
+
+
 class SQLManager:
     """
     SQLManager is a class that manages SQLite database operations for visitors' information
     """
 
-    def __init__(self, connection: Connection):
+    def __init__(self, pool: SQLConnectionPool):
         """
-        Initialize the SQLManager with a database connection.
+        Initialize the SQLManager with a database connection pool.
 
         Args:
-            connection (Connection): SQLite database connection object.
+            pool (SQLConnectionPool): Pool of SQLite read connections and the writer connection.
         """
-        self.connection = connection
-        self.cursor = connection.cursor()
+        self.pool = pool
         self.initialize()
 
     def initialize(self):
+        with self.pool.acquire_write() as connection:
+            self.__create_tables(connection)
+
+        # Clean up any stale pending tasks from previous crashes
+        self.__clear_stale_pending_tasks()
+
+    def __create_tables(self, connection: sqlite3.Connection):
         # Create the necessary tables if they do not exist.
-        self.cursor.execute(
+        connection.execute(
             """
         CREATE TABLE IF NOT EXISTS visitors (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -70,7 +143,7 @@ class SQLManager:
         )
 
         # Upload task table
-        self.cursor.execute(
+        connection.execute(
             """
             CREATE TABLE IF NOT EXISTS upload_tasks (
                 task_id TEXT PRIMARY KEY,
@@ -83,18 +156,16 @@ class SQLManager:
             """
         )
 
-        self.connection.commit()
-
-        # Clean up any stale pending tasks from previous crashes
-        self.__clear_stale_pending_tasks()
+        connection.commit()
 
     def __clear_stale_pending_tasks(self):
         """
         Clear all pending upload tasks that are no longer needed.
         This is used to remove tasks that are stuck in 'PENDING' status.
         """
-        self.cursor.execute("DELETE FROM upload_tasks WHERE status = 'PENDING'")
-        self.connection.commit()
+        with self.pool.acquire_write() as connection:
+            connection.execute("DELETE FROM upload_tasks WHERE status = 'PENDING'")
+            connection.commit()
 
     def insert_upload_task(
         self, task_id: str, file_name: str, file_size: int, file_type: str, status: str
@@ -110,14 +181,15 @@ class SQLManager:
         Raises:
             RuntimeError: If the insertion fails."""
         try:
-            self.cursor.execute(
-                """
-                INSERT INTO upload_tasks (task_id, file_name, file_size, file_type, status)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (task_id, file_name, file_size, file_type, status),
-            )
-            self.connection.commit()
+            with self.pool.acquire_write() as connection:
+                connection.execute(
+                    """
+                    INSERT INTO upload_tasks (task_id, file_name, file_size, file_type, status)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (task_id, file_name, file_size, file_type, status),
+                )
+                connection.commit()
             print(f"Task '{task_id}' inserted with status '{status}'")
         except Exception as e:
             raise RuntimeError(f"Failed to insert task '{task_id}': {e}")
@@ -132,13 +204,14 @@ class SQLManager:
             ValueError: If the task_id does not exist or update fails.
         """
         try:
-            self.cursor.execute(
-                "UPDATE upload_tasks SET status = ? WHERE task_id = ?",
-                (status, task_id),
-            )
-            self.connection.commit()
+            with self.pool.acquire_write() as connection:
+                cursor = connection.execute(
+                    "UPDATE upload_tasks SET status = ? WHERE task_id = ?",
+                    (status, task_id),
+                )
+                connection.commit()
 
-            if self.cursor.rowcount == 0:
+            if cursor.rowcount == 0:
                 raise ValueError(f"No task found with task_id '{task_id}'")
 
             print(f"Task '{task_id}' successfully updated to status '{status}'.")
@@ -149,10 +222,10 @@ class SQLManager:
             )
 
     def get_pending_upload_tasks(self):
-        self.cursor.execute(
-            "SELECT task_id, file_name, file_size, file_type, status FROM upload_tasks WHERE status = 'PENDING'"
-        )
-        rows = self.cursor.fetchall()
+        with self.pool.acquire_read() as connection:
+            rows = connection.execute(
+                "SELECT task_id, file_name, file_size, file_type, status FROM upload_tasks WHERE status = 'PENDING'"
+            ).fetchall()
         return [dict(row) for row in rows]  # Convert to list of dictionaries
 
     def delete_success_tasks(self):
@@ -162,8 +235,9 @@ class SQLManager:
         Args:
             None
         """
-        self.cursor.execute("DELETE FROM upload_tasks WHERE status = 'SUCCESS'")
-        self.connection.commit()
+        with self.pool.acquire_write() as connection:
+            connection.execute("DELETE FROM upload_tasks WHERE status = 'SUCCESS'")
+            connection.commit()
 
     def get_upload_tasks(self):
         """
@@ -171,8 +245,8 @@ class SQLManager:
         Returns:
             list: A list of tuples containing all upload tasks.
         """
-        self.cursor.execute("SELECT * FROM upload_tasks")
-        rows = self.cursor.fetchall()
+        with self.pool.acquire_read() as connection:
+            rows = connection.execute("SELECT * FROM upload_tasks").fetchall()
         return [dict(row) for row in rows]  # Convert to list of dictionaries
 
     def generate_access_code(self):
@@ -199,28 +273,29 @@ class SQLManager:
 
             access_time = datetime.now(timezone.utc).isoformat()
             print(f"[DEBUG] Auto-generated access_time: {access_time}")
-            self.cursor.execute(
-                """
-                INSERT INTO visitors (
-                    name, dob, card_id, purpose, 
-                    access_time, access_code, qr_hash
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    visitor_data["name"],
-                    visitor_data["dob"],
-                    visitor_data["card_id"],
-                    visitor_data["purpose"],
-                    access_time,
-                    access_code,
-                    qr_hash,
-                ),
-            )
+            with self.pool.acquire_write() as connection:
+                cursor = connection.execute(
+                    """
+                    INSERT INTO visitors (
+                        name, dob, card_id, purpose, 
+                        access_time, access_code, qr_hash
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        visitor_data["name"],
+                        visitor_data["dob"],
+                        visitor_data["card_id"],
+                        visitor_data["purpose"],
+                        access_time,
+                        access_code,
+                        qr_hash,
+                    ),
+                )
 
-            # Get the id of the newly inserted visitor
-            visitor_data["id"] = self.cursor.lastrowid
+                # Get the id of the newly inserted visitor
+                visitor_data["id"] = cursor.lastrowid
 
-            self.connection.commit()
+                connection.commit()
             print("[DEBUG] Visitor inserted successfully into DB.")
 
             # Send notification to webhook for all connected clients
@@ -298,8 +373,8 @@ class SQLManager:
         )
 
     def get_all_visitors(self):
-        self.cursor.execute("SELECT * FROM visitors")
-        rows = self.cursor.fetchall()
+        with self.pool.acquire_read() as connection:
+            rows = connection.execute("SELECT * FROM visitors").fetchall()
         return [dict(row) for row in rows]
 
     def update_visitor_by_id(self, visitor_id: int, updated_data: dict):
@@ -313,12 +388,13 @@ class SQLManager:
             values.append(visitor_id)
 
             query = f"UPDATE visitors SET {columns} WHERE id = ?"
-            self.cursor.execute(query, values)
+            with self.pool.acquire_write() as connection:
+                cursor = connection.execute(query, values)
 
-            if self.cursor.rowcount == 0:
-                raise RuntimeError("Visitor not found or no changes made.")
+                if cursor.rowcount == 0:
+                    raise RuntimeError("Visitor not found or no changes made.")
 
-            self.connection.commit()
+                connection.commit()
             print("[DEBUG] Visitor updated successfully.")
             return {"status": "success", "message": "Visitor updated successfully."}
 
@@ -329,12 +405,15 @@ class SQLManager:
     def delete_visitor_by_id(self, visitor_id: int):
         try:
             print(f"[DEBUG] delete_visitor_by_id called for id: {visitor_id}")
-            self.cursor.execute("DELETE FROM visitors WHERE id = ?", (visitor_id,))
+            with self.pool.acquire_write() as connection:
+                cursor = connection.execute(
+                    "DELETE FROM visitors WHERE id = ?", (visitor_id,)
+                )
 
-            if self.cursor.rowcount == 0:
-                raise RuntimeError("Visitor not found.")
+                if cursor.rowcount == 0:
+                    raise RuntimeError("Visitor not found.")
 
-            self.connection.commit()
+                connection.commit()
             print("[DEBUG] Visitor deleted successfully.")
             return {"status": "success", "message": "Visitor deleted successfully."}
 
@@ -16,6 +16,7 @@ Interactions
 
 import uuid
 from pathlib import Path
+import httpx
 from langchain_core.documents import Document
 from langchain_ollama import OllamaEmbeddings
 from langchain_chroma import Chroma
@@ -27,6 +28,7 @@ from langchain_community.document_loaders import (
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from app.core import (
     EMBEDDING_MODEL_NAME,
+    EMBEDDING_KEEP_ALIVE,
     CHROMA_PERSISTS_DIR,
     COLLECTION_NAME,
     OLLAMA_BASE_URL,
@@ -54,7 +56,17 @@ class VectorStoreManager:
             collection_name (str, optional): The name of collection. Defaults to COLLECTION_NAME.
             persist_directory (str, optional): The directory for persiststence. Defaults to CHROMA_PERSISTS_DIR.
         """
-        self.embeddings = OllamaEmbeddings(model=model_name, base_url=OLLAMA_BASE_URL)
+        # One resident embedding model on the Ollama server, reached over a persistent connection
+        self.embeddings = OllamaEmbeddings(
+            model=model_name,
+            base_url=OLLAMA_BASE_URL,
+            keep_alive=EMBEDDING_KEEP_ALIVE,
+            client_kwargs={
+                "limits": httpx.Limits(
+                    max_keepalive_connections=4, keepalive_expiry=3600
+                )
+            },
+        )
         self.vector_store = Chroma(
             collection_name=collection_name,
             embedding_function=self.embeddings,
@@ -68,8 +80,10 @@ class VectorStoreManager:
     def initialize_vectorstore(self):
         """
         Initialize to prevent latency during the first request.
+        Also embeds a dummy query so the embedding model is loaded before the first retrieval.
         """
         _ = self.vector_store.get()
+        _ = self.embeddings.embed_query("warmup")
 
     def get_vectorstore(self) -> Chroma:
         """
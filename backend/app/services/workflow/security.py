@@ -43,7 +43,7 @@ class SecurityNode(BaseNode):
 
         # Signal frontend to start security check: Present QR scanner and liveness check
         self.event_handler.security_status = SecurityCheckStatus.WAITING_FOR_FRONTEND
-        self.event_handler.do_security_check.set()
+        self.event_handler.signal_security_check()
 
         # Wait for security check to complete or timeout
         # The event is set through the set_security_check_results method in workflow_service.py
@@ -92,7 +92,7 @@ class SecurityNode(BaseNode):
 
         self.chat_history.add_messages(state["messages"] + [answer])
         self.event_handler.security_status = SecurityCheckStatus.COMPLETED
-        self.event_handler.security_op_completed.set()
+        self.event_handler.signal_security_op_completed()
 
         return {"answer": answer.content, "messages": answer}
 
@@ -125,6 +125,8 @@ class EventHandler:
         self.do_security_check = threading.Event()
         self.security_check_finished = threading.Event()
         self.security_op_completed = threading.Event()
+        # Set together with the events above so a monitor can wait on a single event
+        self.any_security_event = threading.Event()
 
         self.visitor_data: Optional[dict] = None
         self.liveness_status: bool = False
@@ -139,11 +141,26 @@ class EventHandler:
         self.do_security_check.clear()
         self.security_check_finished.clear()
         self.security_op_completed.clear()
+        self.any_security_event.clear()
 
         self.visitor_data = None
         self.liveness_status = False
         self.permission_data = None
 
+    def signal_security_check(self):
+        """
+        Signals that the frontend should start the security check (QR scan and liveness check).
+        """
+        self.do_security_check.set()
+        self.any_security_event.set()
+
+    def signal_security_op_completed(self):
+        """
+        Signals that the whole security operation is completed and the permission data is ready.
+        """
+        self.security_op_completed.set()
+        self.any_security_event.set()
+
     def set_security_check_results(
         self, cancel: bool, visitor_data: dict = None, liveness_status: bool = None
     ):
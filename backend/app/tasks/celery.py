@@ -1,10 +1,39 @@
 from celery import Celery
-from app.core import CELERY_BROKER_URL, CELERY_RESULT_BACKEND
+from celery.signals import worker_init, worker_shutdown
+from dotenv import load_dotenv
+
+# Load .env once for the worker process, before app.core reads the environment
+load_dotenv(override=False)
+
+from app.core import (
+    CELERY_BROKER_URL,
+    CELERY_RESULT_BACKEND,
+    bootstrap_paths,
+    setup_logging,
+    shutdown_logging,
+)
 from app.dependencies import get_vector_manager
 
 celery = Celery("worker", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
 
 
+@worker_init.connect
+def on_worker_init(**kwargs):
+    """
+    Set up logging and prepare the upload/db directories and default config files once when the worker starts.
+    """
+    setup_logging()
+    bootstrap_paths()
+
+
+@worker_shutdown.connect
+def on_worker_shutdown(**kwargs):
+    """
+    Flush the queued log records before the worker exits.
+    """
+    shutdown_logging()
+
+
 @celery.task(name="document_indexing")
 def document_indexing(path: str, file_name: str):
     """